@@ -38,6 +38,16 @@ contract SwagFormProofManager {
         bool verified;
     }
 
+    // Constant-size proof of a tweet from the API's commitment=true mode: the author
+    // and text are replaced by contentHash = keccak256(abi.encodePacked(author, "\n", text))
+    // over the lowercased author and the normalized text
+    struct TweetCommitment {
+        string tweetId;
+        bytes32 contentHash;
+        bool exists;
+        uint256 timestamp;
+    }
+
     struct ProofLink {
         uint256 formId;
         uint256 questionIndex;
@@ -46,11 +56,18 @@ contract SwagFormProofManager {
         uint256 verificationTimestamp;
     }
 
+    // Tweet IDs are Snowflakes: milliseconds since this epoch sit above bit 22.
+    // IDs up to LAST_SEQUENTIAL_TWEET_ID predate Snowflake and carry no time.
+    uint256 private constant SNOWFLAKE_EPOCH_MS = 1288834974657;
+    uint256 private constant LAST_SEQUENTIAL_TWEET_ID = 29999999999;
+
     // State variables
     mapping(string => TweetData) public tweetData;
     mapping(bytes32 => ProofLink) public proofLinks;
     mapping(uint256 => mapping(uint256 => mapping(address => string))) public userTweetForQuestion;
     mapping(string => bool) public verifiedTweets;
+    // Tweets verified through verifyTweetCommitment -> their contentHash
+    mapping(string => bytes32) public tweetContentHash;
     
     // Form -> Question -> User -> Verification status
     mapping(uint256 => mapping(uint256 => mapping(address => bool))) public isProofVerified;
@@ -91,6 +108,8 @@ contract SwagFormProofManager {
             timestamp: tweet.timestamp,
             verified: true
         });
+        // The full data supersedes a content hash from an earlier commitment proof
+        delete tweetContentHash[tweet.tweetId];
 
         // Mark as verified
         if (tweet.exists && !verifiedTweets[tweet.tweetId]) {
@@ -108,6 +127,56 @@ contract SwagFormProofManager {
         );
     }
 
+    /**
+     * @dev Verify a tweet from a commitment-mode Web2Json proof. Only the content hash is
+     * stored; the author and text are retrievable by hash from the verification API
+     * and can be checked against it with isTweetContentCommitted. A tweet already
+     * verified with its full data keeps that data and gets no content hash.
+     * @param proof The FDC proof containing the tweet commitment
+     */
+    function verifyTweetCommitment(IWeb2Json.Proof memory proof)
+        external
+        onlyValidProof(proof)
+    {
+        TweetCommitment memory commitment = abi.decode(proof.data.responseBody.abiEncodedData, (TweetCommitment));
+
+        if (!hasFullTweetData(commitment.tweetId)) {
+            tweetData[commitment.tweetId] = TweetData({
+                tweetId: commitment.tweetId,
+                authorUsername: "",
+                tweetText: "",
+                createdAt: "",
+                exists: commitment.exists,
+                timestamp: commitment.timestamp,
+                verified: true
+            });
+            tweetContentHash[commitment.tweetId] = commitment.contentHash;
+        }
+
+        if (commitment.exists && !verifiedTweets[commitment.tweetId]) {
+            verifiedTweets[commitment.tweetId] = true;
+            allVerifiedTweets.push(commitment.tweetId);
+        }
+
+        emit TweetVerified(0, 0, msg.sender, commitment.tweetId, commitment.exists, commitment.timestamp);
+    }
+
+    /**
+     * @dev Check an author and text against the content hash of a commitment-verified tweet
+     * @param tweetId The tweet ID
+     * @param author The author username, lowercased
+     * @param normalizedText The tweet text normalized as by the verification API
+     * @return bool True if they match the attested content hash
+     */
+    function isTweetContentCommitted(
+        string memory tweetId,
+        string memory author,
+        string memory normalizedText
+    ) external view returns (bool) {
+        bytes32 contentHash = tweetContentHash[tweetId];
+        return contentHash != bytes32(0) && contentHash == keccak256(abi.encodePacked(author, "\n", normalizedText));
+    }
+
     /**
      * @dev Link verified tweet proof to a specific form question
      * @param formId The World Chain form ID
@@ -213,6 +282,34 @@ contract SwagFormProofManager {
         return verifiedTweets[tweetId] && tweetData[tweetId].exists;
     }
 
+    /**
+     * @dev Creation time of a tweet decoded from its Snowflake ID, no proof needed
+     * @param tweetId The tweet ID
+     * @return uint256 Unix timestamp in seconds, 0 for pre-Snowflake IDs
+     */
+    function tweetCreatedAtFromId(string memory tweetId) public pure onlyValidTweetId(tweetId) returns (uint256) {
+        bytes memory tweetIdBytes = bytes(tweetId);
+        uint256 id = 0;
+        for (uint256 i = 0; i < tweetIdBytes.length; i++) {
+            id = id * 10 + (uint8(tweetIdBytes[i]) - 0x30);
+        }
+        if (id <= LAST_SEQUENTIAL_TWEET_ID) {
+            return 0;
+        }
+        return ((id >> 22) + SNOWFLAKE_EPOCH_MS) / 1000;
+    }
+
+    /**
+     * @dev Check that a tweet was posted at or after a start time (e.g. an event start)
+     * @param tweetId The tweet ID
+     * @param startTime Unix timestamp in seconds
+     * @return bool True if the tweet ID was minted at or after startTime
+     */
+    function isTweetedAfter(string memory tweetId, uint256 startTime) public pure returns (bool) {
+        uint256 createdAt = tweetCreatedAtFromId(tweetId);
+        return createdAt != 0 && createdAt >= startTime;
+    }
+
     /**
      * @dev Get total number of verified tweets
      * @return uint256 Total count
@@ -236,6 +333,16 @@ contract SwagFormProofManager {
         }
     }
 
+    /**
+     * @dev Check whether a tweet is stored with its author and text, not just a content hash
+     * @param tweetId The tweet ID
+     * @return bool True if a full proof (or manualVerifyTweet) stored an existing tweet
+     */
+    function hasFullTweetData(string memory tweetId) internal view returns (bool) {
+        TweetData storage stored = tweetData[tweetId];
+        return stored.verified && stored.exists && tweetContentHash[tweetId] == bytes32(0);
+    }
+
     /**
      * @dev Decode tweet data from ABI encoded response
      * @param encodedData The ABI encoded tweet data
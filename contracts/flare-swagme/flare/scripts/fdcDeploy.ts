@@ -18,6 +18,12 @@ const body = "{}";
 // ABI signature for TweetData struct - must be escaped JSON string per Flare documentation
 const abiSignature = `{\\"components\\": [{\\"internalType\\": \\"string\\", \\"name\\": \\"tweetId\\", \\"type\\": \\"string\\"}, {\\"internalType\\": \\"string\\", \\"name\\": \\"authorUsername\\", \\"type\\": \\"string\\"}, {\\"internalType\\": \\"string\\", \\"name\\": \\"tweetText\\", \\"type\\": \\"string\\"}, {\\"internalType\\": \\"string\\", \\"name\\": \\"createdAt\\", \\"type\\": \\"string\\"}, {\\"internalType\\": \\"bool\\", \\"name\\": \\"exists\\", \\"type\\": \\"bool\\"}, {\\"internalType\\": \\"uint256\\", \\"name\\": \\"timestamp\\", \\"type\\": \\"uint256\\"}], \\"internalType\\": \\"struct TweetData\\", \\"name\\": \\"tweetData\\", \\"type\\": \\"tuple\\"}`;
 
+// Commitment mode (FDC_PROOF_MODE=commitment): the API returns a keccak256 contentHash of the
+// author and normalized text instead of the text, so the attested payload has a constant size
+const proofMode = process.env.FDC_PROOF_MODE === "commitment" ? "commitment" : "full";
+const commitmentPostProcessJq = `{tweetId: .data.tweetId, contentHash: .data.contentHash, exists: .data.exists, timestamp: .data.timestamp}`;
+const commitmentAbiSignature = `{\\"components\\": [{\\"internalType\\": \\"string\\", \\"name\\": \\"tweetId\\", \\"type\\": \\"string\\"}, {\\"internalType\\": \\"bytes32\\", \\"name\\": \\"contentHash\\", \\"type\\": \\"bytes32\\"}, {\\"internalType\\": \\"bool\\", \\"name\\": \\"exists\\", \\"type\\": \\"bool\\"}, {\\"internalType\\": \\"uint256\\", \\"name\\": \\"timestamp\\", \\"type\\": \\"uint256\\"}], \\"internalType\\": \\"struct TweetCommitment\\", \\"name\\": \\"tweetCommitment\\", \\"type\\": \\"tuple\\"}`;
+
 // Configuration constants
 const attestationTypeBase = "Web2Json";
 const sourceIdBase = "testnet";
@@ -27,7 +33,9 @@ async function prepareAttestationRequest(tweetId: string) {
     console.log(`Preparing attestation request for tweet: ${tweetId}`);
     
     // Construct the API URL for verify-tweet endpoint
-    const apiUrl = `${baseApiUrl}/api/v1/verify-tweet?url=${tweetId}`;
+    // fields=data: the response carries only the object postProcessJq reads
+    const commitmentParam = proofMode === "commitment" ? "&commitment=true" : "";
+    const apiUrl = `${baseApiUrl}/api/v1/verify-tweet?url=${tweetId}&fields=data${commitmentParam}`;
     console.log(`API URL: ${apiUrl}`);
     
     // Format request body as JSON string according to Flare documentation
@@ -37,8 +45,8 @@ async function prepareAttestationRequest(tweetId: string) {
         headers: headers,
         queryParams: queryParams,
         body: body,
-        postProcessJq: postProcessJq,
-        abiSignature: abiSignature,
+        postProcessJq: proofMode === "commitment" ? commitmentPostProcessJq : postProcessJq,
+        abiSignature: proofMode === "commitment" ? commitmentAbiSignature : abiSignature,
     });
 
     const url = `${verifierUrlBase}Web2Json/prepareRequest`;
@@ -98,7 +106,8 @@ async function interactWithContract(proofManagerContract: any, proof: any, tweet
     console.log("Decoded proof:", decodedResponse, "\n");
     
     // Verify the tweet data using FDC proof
-    const transaction = await proofManagerContract.verifyTweetData({
+    const verify = proofMode === "commitment" ? proofManagerContract.verifyTweetCommitment : proofManagerContract.verifyTweetData;
+    const transaction = await verify({
         merkleProof: proof.proof,
         data: decodedResponse,
     });
@@ -0,0 +1,234 @@
+"""Worst-case timing suite: hostile or broken upstream pages against every extractor.
+
+Each case is generated in a child process, size-limited and parsed like
+scrape_tweet_from_twitter does, and then run through every extractor that applies to it. The suite fails
+(exit 1) when parsing or an extractor exceeds its CPU-time ceiling, an extractor
+exceeds the peak-memory ceiling for a page, a JSON body meant to be parsed is
+not, or one over MAX_PAGE_BYTES is, and kills cases that run past the hard
+wall-clock limit.
+
+    python bench/adversarial.py
+    python bench/adversarial.py --cpu-ceiling 1.0 --memory-ceiling-mb 100 --filter quoted
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+import tracemalloc
+
+from harness import API_DIR, format_table
+
+TWEET_ID = "1940801319423623380"
+MB = 1024 * 1024
+
+
+def deep_json_script() -> str:
+    depth = 200_000
+    payload = '{"tweet":' * depth + f'{{"text":"{TWEET_ID}"}}' + '}' * depth
+    return f"<html><head><script>{payload}</script></head><body></body></html>"
+
+
+def near_limit_json_script() -> str:
+    # Nesting just inside the JSON decoder's limit so the recursive walk has to run
+    depth = 900
+    payload = '{"text":"short","tweet":' * depth + f'"{TWEET_ID}"' + '}' * depth
+    return f"<html><head><script>{payload}</script></head><body></body></html>"
+
+
+def single_line_text() -> str:
+    words = "lorem ipsum dolor sit amet consectetur adipiscing elit "
+    return "<html><body><p>" + words * (10 * MB // len(words)) + TWEET_ID + "</p></body></html>"
+
+
+def single_line_angle_brackets() -> str:
+    return "<html><body><p>" + TWEET_ID + "&gt;" + ">" * (10 * MB) + "</p></body></html>"
+
+
+def single_line_no_tags() -> str:
+    return TWEET_ID + "x" * (10 * MB)
+
+
+def quoted_strings() -> str:
+    quoted = '"privacy cookie notice shown before sign in to continue"'
+    return (f"<html><body><div data-id=\"{TWEET_ID}\">" + (quoted + " ") * 100_000
+            + "</div></body></html>")
+
+
+def single_quoted_strings() -> str:
+    quoted = "'privacy cookie notice shown before sign in to continue'"
+    return f"<html><body><div>{TWEET_ID}" + (quoted + " ") * 100_000 + "</div></body></html>"
+
+
+def tweet_id_everywhere() -> str:
+    row = f'<div class="tweet-link" data-id="{TWEET_ID}">{TWEET_ID}</div>\n'
+    return "<html><body>" + row * 150_000 + "</body></html>"
+
+
+def many_scripts() -> str:
+    script = f'<script>{{"text": "{TWEET_ID} tweet", broken</script>\n'
+    return "<html><head>" + script * 50_000 + "</head><body></body></html>"
+
+
+def many_nitter_containers() -> str:
+    row = f'<div class="timeline-tweet"><a class="username">@u</a><div class="tweet-body">{TWEET_ID}</div></div>\n'
+    return "<html><body>" + row * 50_000 + "</body></html>"
+
+
+def timeline_json(size: int) -> str:
+    """A timeline of as many entries as fit in about size bytes"""
+    entry = {"content": {"item": {"content": {"tweet": {"id": "1", "legacy": {"full_text": "x" * 40}}}}}}
+    count = (size - 100) // (len(json.dumps(entry)) + 2)
+    return json.dumps({"timeline": {"instructions": [{"addEntries": {"entries": [entry] * count}}]}})
+
+
+def max_page_bytes() -> int:
+    import main
+    return main.MAX_PAGE_BYTES
+
+
+def huge_timeline_json() -> str:
+    # Just under MAX_PAGE_BYTES, so the whole body is parsed and walked
+    return timeline_json(max_page_bytes() - 1024)
+
+
+def oversized_timeline_json() -> str:
+    return timeline_json(5 * max_page_bytes())
+
+
+def deep_json_body() -> str:
+    depth = 900
+    return '{"user":' * depth + '{}' + '}' * depth
+
+
+# name -> (generator, "html" or "json")
+CASES = {
+    "deep_json_script": (deep_json_script, "html"),
+    "near_limit_json_script": (near_limit_json_script, "html"),
+    "single_line_text_10mb": (single_line_text, "html"),
+    "single_line_angle_brackets_10mb": (single_line_angle_brackets, "html"),
+    "single_line_no_tags_10mb": (single_line_no_tags, "html"),
+    "quoted_strings": (quoted_strings, "html"),
+    "single_quoted_strings": (single_quoted_strings, "html"),
+    "tweet_id_everywhere": (tweet_id_everywhere, "html"),
+    "many_scripts": (many_scripts, "html"),
+    "many_nitter_containers": (many_nitter_containers, "html"),
+    "huge_timeline_json": (huge_timeline_json, "json"),
+    "oversized_timeline_json": (oversized_timeline_json, "json"),
+    "deep_json_body": (deep_json_body, "json"),
+}
+# JSON bodies that must be rejected by size before parsing
+OVERSIZED_CASES = {"oversized_timeline_json"}
+
+
+def cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_case(name: str, extractor: str, measure_memory: bool, conn):
+    """Child process: build the page, parse it and time one extractor call"""
+    sys.path.insert(0, str(API_DIR))
+    import main
+    from bs4 import BeautifulSoup
+
+    generator, kind = CASES[name]
+    body = generator()
+    result = {"page_mb": round(len(body) / MB, 2)}
+
+    start = cpu_seconds()
+    if kind == "json":
+        data = main.parse_json_body(body)
+        result["parsed"] = data is not None
+        call = lambda: main.extract_tweet_data_from_json(data, TWEET_ID)
+    else:
+        soup = BeautifulSoup(main.limit_page_size(body), "html.parser")
+        url = f"https://nitter.net/i/status/{TWEET_ID}" if extractor == "nitter" else f"https://x.com/i/web/status/{TWEET_ID}"
+        func = main.extract_tweet_data_from_nitter if extractor == "nitter" else main.extract_tweet_data_from_html
+        call = lambda: func(soup, TWEET_ID, url)
+    result["parse_cpu_s"] = round(cpu_seconds() - start, 3)
+
+    if measure_memory:
+        tracemalloc.start()
+        call()
+        result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / MB, 1)
+        tracemalloc.stop()
+    else:
+        start = cpu_seconds()
+        tweet = call()
+        result["cpu_s"] = round(cpu_seconds() - start, 3)
+        result["exists"] = tweet.exists
+    conn.send(result)
+
+
+def run_isolated(name: str, extractor: str, measure_memory: bool, wall_limit: float) -> dict:
+    parent, child = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=run_case, args=(name, extractor, measure_memory, child))
+    process.start()
+    child.close()
+    deadline = time.monotonic() + wall_limit
+    result = None
+    while time.monotonic() < deadline:
+        if parent.poll(0.1):
+            result = parent.recv()
+            break
+        if not process.is_alive():
+            break
+    if process.is_alive():
+        process.kill()
+    process.join()
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cpu-ceiling", type=float, default=2.0, help="max extractor CPU seconds per page")
+    parser.add_argument("--parse-cpu-ceiling", type=float, default=2.0,
+                        help="max CPU seconds to size-limit and parse a page")
+    parser.add_argument("--memory-ceiling-mb", type=float, default=150.0, help="max extractor peak traced memory per page")
+    parser.add_argument("--wall-limit", type=float, default=120.0, help="kill a case after this many seconds")
+    parser.add_argument("--filter", default="", help="only run cases containing this substring")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None) -> int:
+    args = parse_args(argv)
+    rows, failures = [], []
+    for name, (_, kind) in CASES.items():
+        if args.filter not in name:
+            continue
+        for extractor in (["json"] if kind == "json" else ["html", "nitter"]):
+            case = f"{name}/{extractor}"
+            timing = run_isolated(name, extractor, False, args.wall_limit)
+            if timing is None:
+                failures.append(f"{case}: killed after {args.wall_limit}s or crashed")
+                rows.append({"case": case, "status": "KILLED"})
+                continue
+
+            row = {"case": case, **timing}
+            if "parsed" in timing and timing["parsed"] != (name not in OVERSIZED_CASES):
+                expected = "rejected by size" if name in OVERSIZED_CASES else "parsed"
+                failures.append(f"{case}: {timing['page_mb']}MB body was not {expected}")
+            if timing["parse_cpu_s"] > args.parse_cpu_ceiling:
+                failures.append(f"{case}: parsing took {timing['parse_cpu_s']}s CPU > {args.parse_cpu_ceiling}s")
+            if timing["cpu_s"] > args.cpu_ceiling:
+                failures.append(f"{case}: {timing['cpu_s']}s CPU > {args.cpu_ceiling}s")
+            else:
+                memory = run_isolated(name, extractor, True, args.wall_limit)
+                row["peak_mb"] = memory["peak_mb"] if memory else "KILLED"
+                if memory is None or memory["peak_mb"] > args.memory_ceiling_mb:
+                    failures.append(f"{case}: peak {row['peak_mb']}MB > {args.memory_ceiling_mb}MB")
+            row["status"] = "FAIL" if any(failure.startswith(case + ":") for failure in failures) else "ok"
+            rows.append(row)
+            print(format_table([row], ["case", "page_mb", "parsed", "parse_cpu_s", "cpu_s", "peak_mb", "exists", "status"]), flush=True)
+
+    print()
+    print(format_table(rows, ["case", "page_mb", "parsed", "parse_cpu_s", "cpu_s", "peak_mb", "exists", "status"]))
+    for failure in failures:
+        print("FAIL", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,108 @@
+"""Cost of result objects on the per-source extraction path of a verification.
+
+Runs main.extract_from_response, the work a verification does for every
+upstream page it reads, over the saved corpus, once for the tweet on the page
+(hit) and once for another tweet ID (miss, where extractors only build
+not-found placeholders). Each case runs twice:
+  record  results are slotted TweetRecord objects (what the scraper uses)
+  model   results are pydantic TweetData models (as before TweetRecord)
+and reports median time, result objects built and peak traced memory per call.
+
+    python bench/allocations.py
+    python bench/allocations.py --runs 500 --json allocations.json
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from corpus import CORPUS_TWEET_ID, load_corpus
+from harness import API_DIR, format_table, tweet_ids
+
+sys.path.insert(0, str(API_DIR))
+import main  # noqa: E402
+
+COLUMNS = ["case", "kind", "median_us", "results", "peak_kb"]
+
+
+class CountingFactory:
+    """Stands in for main.TweetRecord, counting the result objects extractors build"""
+
+    def __init__(self, build):
+        self.build = build
+        self.built = 0
+
+    def __call__(self, **fields):
+        self.built += 1
+        return self.build(**fields)
+
+
+def measure(page, tweet_id: str, factory: CountingFactory, runs: int) -> dict:
+    call = lambda: main.extract_from_response(page.url, tweet_id, page.content_type, page.body)
+    call()
+    timings = []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    factory.built = 0
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "median_us": round(statistics.median(timings) * 1e6, 1),
+        "results": factory.built,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200, help="timed calls per case (the bootstrap page is capped at 20)")
+    parser.add_argument("--filter", default="", help="only pages whose name contains this substring")
+    parser.add_argument("--json", dest="json_path", help="also write the rows to this file")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    kinds = {
+        "record": CountingFactory(main.TweetRecord),
+        "model": CountingFactory(main.TweetData),
+    }
+    original = main.TweetRecord
+    missing_id = tweet_ids(1, offset=10**6)[0]
+    rows = []
+    try:
+        for page in load_corpus():
+            if args.filter not in page.name:
+                continue
+            runs = min(args.runs, 20) if len(page.body) > 1024 * 1024 else args.runs
+            for case, tweet_id in ((f"{page.name}/hit", CORPUS_TWEET_ID), (f"{page.name}/miss", missing_id)):
+                for kind, factory in kinds.items():
+                    main.TweetRecord = factory
+                    row = {"case": case, "kind": kind, **measure(page, tweet_id, factory, runs)}
+                    rows.append(row)
+                    print(format_table([row], COLUMNS), flush=True)
+    finally:
+        main.TweetRecord = original
+
+    print()
+    print(format_table(rows, COLUMNS))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main_cli()
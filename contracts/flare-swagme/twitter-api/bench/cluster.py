@@ -0,0 +1,121 @@
+"""Cluster mode check: several local API instances sharing the tweet ID space.
+
+Starts N instances with CLUSTER_NODES listing all of them, each with its own
+result cache, and sends every request to a random instance the way a load
+balancer would. Each tweet is then requested R times in total. With
+consistent-hash forwarding every tweet is scraped once cluster-wide. Without
+it (--no-cluster) each instance scrapes it again. The report compares the
+upstream fetches the stubs served and checks which node owns each tweet.
+Finally a client forges X-Cluster-Forwarded without the cluster secret; the
+node it hits must still forward the request to the tweet's owner.
+
+    python bench/cluster.py --nodes 3 --tweets 100 --repeats 4
+    python bench/cluster.py --nodes 3 --no-cluster
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from contextlib import ExitStack
+
+import httpx
+
+from harness import API_DIR, api_server, free_port, stub_upstreams, tweet_ids
+
+sys.path.insert(0, str(API_DIR))
+
+
+async def drive(nodes: list, ids: list, repeats: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    requests = [(rng.choice(nodes), tweet_id) for tweet_id in ids for _ in range(repeats)]
+    rng.shuffle(requests)
+    semaphore = asyncio.Semaphore(concurrency)
+    verified = 0
+
+    async with httpx.AsyncClient(timeout=120.0) as client:
+        async def one(node: str, tweet_id: str):
+            nonlocal verified
+            async with semaphore:
+                response = await client.get(f"{node}/api/v1/verify-tweet", params={"url": tweet_id})
+                verified += response.status_code == 200 and response.json()["verified"]
+
+        await asyncio.gather(*(one(node, tweet_id) for node, tweet_id in requests))
+        statuses = [(await client.get(f"{node}/api/v1/status")).json() for node in nodes]
+    return {"requests": len(requests), "verified": verified, "statuses": statuses}
+
+
+async def forged_forward(nodes: list, ring, tweet_id: str) -> dict:
+    """Send a forged X-Cluster-Forwarded for tweet_id to a node that does not own it"""
+    owner = ring.owner(tweet_id)
+    node = next(url for url in nodes if url != owner)
+    async with httpx.AsyncClient(timeout=120.0) as client:
+        before = (await client.get(f"{node}/api/v1/status")).json()["cluster"]
+        response = await client.get(f"{node}/api/v1/tweets/{tweet_id}", headers={"X-Cluster-Forwarded": "http://forged"})
+        after = (await client.get(f"{node}/api/v1/status")).json()["cluster"]
+    return {
+        "status": response.status_code,
+        "forwarded": after.get("forwarded", 0) - before.get("forwarded", 0),
+        "received_forwarded": after.get("received_forwarded", 0) - before.get("received_forwarded", 0),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=3)
+    parser.add_argument("--tweets", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=4, help="requests per tweet, spread over random nodes")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-cluster", action="store_true", help="run the instances independently for comparison")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    ports = [free_port() for _ in range(args.nodes)]
+    node_urls = [f"http://127.0.0.1:{port}" for port in ports]
+    ids = tweet_ids(args.tweets)
+
+    with ExitStack() as stack:
+        upstream = stack.enter_context(stub_upstreams(["--latency-ms", "20"]))
+        cache_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        for port, url in zip(ports, node_urls):
+            env = {"RESULT_CACHE_PATH": os.path.join(cache_dir, f"{port}.sqlite3")}
+            if not args.no_cluster:
+                env.update({"CLUSTER_NODES": ",".join(node_urls), "CLUSTER_SELF_URL": url, "CLUSTER_SECRET": "bench"})
+            stack.enter_context(api_server(upstream, env=env, port=port))
+
+        result = asyncio.run(drive(node_urls, ids, args.repeats, args.concurrency, args.seed))
+        upstream_stats = httpx.get(f"{upstream}/stats").json()
+        if not args.no_cluster:
+            import main as api
+            ring = api.HashRing(node_urls, api.CLUSTER_VNODES)
+            forged = asyncio.run(forged_forward(node_urls, ring, tweet_ids(1, offset=args.tweets)[0]))
+
+    print(f"mode: {'independent' if args.no_cluster else 'cluster'}  nodes: {args.nodes}  "
+          f"requests: {result['requests']}  verified: {result['verified']}")
+    for url, status in zip(node_urls, result["statuses"]):
+        cache, cluster = status["result_cache"], status["cluster"]
+        print(f"  {url}  cache hits {cache['hits']:4d} misses {cache['misses']:4d}  "
+              f"forwarded {cluster.get('forwarded', 0):4d} received {cluster.get('received_forwarded', 0):4d}")
+    print(f"tweets scraped upstream: {upstream_stats['unique_tweets']} unique, "
+          f"{upstream_stats['requests']} upstream requests for {args.tweets} tweets")
+
+    if args.no_cluster:
+        return 0
+
+    # Every node must agree on ownership, and each tweet must have been scraped by its owner only
+    owned = {url: sum(ring.owner(tweet_id) == url for tweet_id in ids) for url in node_urls}
+    print("ownership:", ", ".join(f"{url.rsplit(':', 1)[1]}={count}" for url, count in owned.items()))
+    misses = sum(status["result_cache"]["misses"] for status in result["statuses"])
+    ok = result["verified"] == result["requests"] and misses == args.tweets
+    print("OK" if ok else f"FAIL: expected {args.tweets} cache misses cluster-wide, got {misses}")
+    forged_ok = forged["status"] == 200 and forged["forwarded"] == 1 and forged["received_forwarded"] == 0
+    print(f"forged X-Cluster-Forwarded: {'forwarded to the owner' if forged_ok else f'FAIL: {forged}'}")
+    return 0 if ok and forged_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Saved upstream page corpus shared by the extractor benchmarks.
+
+Pages are the checked-in fixtures in bench/fixtures. The multi-megabyte x.com
+bootstrap page is expanded deterministically from x_status.html so the repo
+does not carry megabytes of generated HTML.
+"""
+import json
+import random
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+CORPUS_TWEET_ID = "1940801319423623380"
+
+
+class Page:
+    """One corpus entry: the raw body plus the URL and content type it came from"""
+
+    def __init__(self, name: str, url: str, content_type: str, body: str):
+        self.name = name
+        self.url = url
+        self.content_type = content_type
+        self.body = body
+
+    @property
+    def is_json(self) -> bool:
+        return self.content_type.startswith("application/json")
+
+
+def fixture(name: str, tweet_id: str = CORPUS_TWEET_ID) -> str:
+    return (FIXTURES_DIR / name).read_text().replace("{{TWEET_ID}}", tweet_id)
+
+
+def bootstrap_state(tweet_id: str, target_bytes: int) -> dict:
+    """A logged-out x.com __INITIAL_STATE__ padded with cached timeline entities"""
+    rng = random.Random(1940801319)
+    words = ("flare data connector attestation oracle swag event proof builders "
+             "onchain web2 verify round voting ftso fassets devs hackathon").split()
+    tweets, users = {}, {}
+    size, n = 0, 0
+    while size < target_bytes:
+        rest_id = str(int(tweet_id) - (n + 1) * 4096)
+        screen_name = f"user{rng.randrange(10**6)}"
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(8, 40)))
+        tweets[rest_id] = {
+            "id_str": rest_id, "full_text": text, "lang": "en",
+            "created_at": "Thu Jul 03 14:01:12 +0000 2025",
+            "favorite_count": rng.randrange(5000), "retweet_count": rng.randrange(900),
+            "entities": {"hashtags": [], "urls": [], "user_mentions": [], "symbols": []},
+            "user_id_str": str(rng.randrange(10**9)), "conversation_id_str": rest_id,
+        }
+        users[screen_name] = {"screen_name": screen_name, "name": screen_name.title(),
+                              "description": " ".join(rng.choice(words) for _ in range(12)),
+                              "followers_count": rng.randrange(10**5)}
+        size += len(text) + 420
+        n += 1
+    return {"entities": {"tweets": {"entities": tweets, "errors": {}, "fetchStatus": {}},
+                         "users": {"entities": users, "errors": {}, "fetchStatus": {}}},
+            "router": {"location": {"pathname": f"/FlareNetworks/status/{tweet_id}"}}}
+
+
+def bootstrap_page(tweet_id: str = CORPUS_TWEET_ID, target_bytes: int = 3 * 1024 * 1024) -> str:
+    shell = fixture("x_status.html", tweet_id)
+    state = json.dumps(bootstrap_state(tweet_id, target_bytes), separators=(",", ":"))
+    return shell.replace("window.__SCRIPTS_LOADED__ = {};",
+                         "window.__SCRIPTS_LOADED__ = {};\nwindow.__BOOTSTRAP_STATE__=" + state + ";", 1)
+
+
+def load_corpus(tweet_id: str = CORPUS_TWEET_ID) -> list:
+    html = "text/html; charset=utf-8"
+    json_type = "application/json; charset=utf-8"
+    return [
+        Page("syndication_tweet", f"https://cdn.syndication.twimg.com/tweet-result?id={tweet_id}&lang=en&token=0", json_type, fixture("tweet_result.json", tweet_id)),
+        Page("nitter_status", f"https://nitter.net/i/status/{tweet_id}", html, fixture("nitter_status.html", tweet_id)),
+        Page("oembed", f"https://publish.twitter.com/oembed?url=https://twitter.com/i/web/status/{tweet_id}", json_type, fixture("oembed.json", tweet_id)),
+        Page("syndication_timeline", f"https://syndication.twitter.com/srv/timeline-profile/screen-name/twitter?tweet_id={tweet_id}", json_type, fixture("syndication_timeline.json", tweet_id)),
+        Page("x_status", f"https://x.com/i/web/status/{tweet_id}", html, fixture("x_status.html", tweet_id)),
+        Page("x_bootstrap", f"https://x.com/i/web/status/{tweet_id}", html, bootstrap_page(tweet_id)),
+    ]
@@ -0,0 +1,99 @@
+"""Offline end-to-end benchmark for /api/v1/verify-tweet.
+
+Starts the stub upstreams and the API, drives verify-tweet with a fixed
+number of concurrent clients and reports p50/p95/p99 latency and throughput.
+
+    python bench/e2e.py --requests 500 --concurrency 50
+    python bench/e2e.py --stub-args="--rate-404 0.2 --rate-429 0.05"
+    python bench/e2e.py --target http://127.0.0.1:8000   # already running API
+"""
+import argparse
+import asyncio
+import json
+import shlex
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+import httpx
+
+from harness import api_server, format_table, stub_upstreams, summarize, tweet_ids
+
+
+async def drive(base_url: str, ids: list, total: int, concurrency: int, timeout: float, mode: str = "full") -> dict:
+    """Send total verify-tweet requests from concurrency workers, cycling through ids"""
+    latencies, errors, verified = [], 0, 0
+    error_kinds = Counter()
+    counter = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors, verified
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await client.get("/api/v1/verify-tweet", params={"url": ids[i % len(ids)], "mode": mode})
+                if response.status_code != 200:
+                    errors += 1
+                    error_kinds[f"http_{response.status_code}"] += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                verified += bool(response.json().get("verified"))
+            except httpx.HTTPError as e:
+                errors += 1
+                error_kinds[type(e).__name__] += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    result = summarize(latencies, elapsed, errors)
+    result["verified"] = verified
+    result["error_kinds"] = dict(error_kinds)
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--unique-ids", type=int, default=0, help="distinct tweet IDs to cycle through (0 = all unique)")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed requests sent first")
+    parser.add_argument("--timeout", type=float, default=60.0, help="client timeout per request")
+    parser.add_argument("--mode", choices=["full", "exists"], default="full", help="verify-tweet mode")
+    parser.add_argument("--target", help="benchmark an already running API instead of starting one")
+    parser.add_argument("--stub-args", default="", help="extra arguments for stub_upstreams.py")
+    # uvicorn 0.24 can arm the keep-alive timer of a reused connection while the
+    # next request is in flight, dropping responses slower than the timeout
+    parser.add_argument("--server-args", default="--timeout-keep-alive 75", help="extra arguments for the API's uvicorn command")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    ids = tweet_ids(args.unique_ids or args.requests)
+
+    with ExitStack() as stack:
+        base_url = args.target
+        if not base_url:
+            upstream = stack.enter_context(stub_upstreams(shlex.split(args.stub_args)))
+            base_url = stack.enter_context(api_server(upstream, server_args=shlex.split(args.server_args)))
+
+        if args.warmup:
+            asyncio.run(drive(base_url, tweet_ids(args.warmup, offset=10**6), args.warmup, min(args.warmup, args.concurrency), args.timeout))
+        result = asyncio.run(drive(base_url, ids, args.requests, args.concurrency, args.timeout, args.mode))
+
+    result["concurrency"] = args.concurrency
+    print(format_table([result], ["requests", "concurrency", "errors", "verified", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms"]))
+    if result["error_kinds"]:
+        print("errors:", ", ".join(f"{kind}={count}" for kind, count in sorted(result["error_kinds"].items())))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
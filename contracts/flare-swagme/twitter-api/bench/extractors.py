@@ -0,0 +1,173 @@
+"""Extractor microbenchmarks over the saved page corpus, with a regression gate.
+
+Times extract_tweet_data_from_html, extract_tweet_data_from_nitter and
+extract_tweet_data_from_json individually (plus the BeautifulSoup parse they
+depend on) and records median time and peak traced memory per page. Times are
+compared by the fastest run as a multiple of the fastest calibration loop (the
+stdlib HTML parser over a fixed synthetic page) timed in the same run, so a
+baseline recorded on one machine holds on another; peak memory is compared as is.
+
+    python bench/extractors.py --update-baseline        # record bench/baselines/extractors.json
+    python bench/extractors.py                          # compare, exit 1 on regression or without a baseline
+"""
+import argparse
+import gc
+import html.parser
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from corpus import CORPUS_TWEET_ID, load_corpus
+from harness import API_DIR, BENCH_DIR, format_table
+
+sys.path.insert(0, str(API_DIR))
+import main  # noqa: E402
+
+DEFAULT_BASELINE = BENCH_DIR / "baselines" / "extractors.json"
+DEFAULT_OUTPUT = BENCH_DIR / "results" / "extractors.json"
+
+
+def benchmark_cases(corpus: list, tweet_id: str) -> list:
+    """(case name, page size, callable) for every extractor that applies to each page"""
+    cases = []
+    for page in corpus:
+        size = len(page.body.encode())
+        if page.is_json:
+            data = json.loads(page.body)
+            extractor = main.json_extractor_for(page.url)
+            cases.append((f"{page.name}/json", size, lambda data=data, extractor=extractor: extractor(data, tweet_id)))
+            continue
+
+        soup = BeautifulSoup(page.body, "html.parser")
+        cases.append((f"{page.name}/parse", size, lambda body=page.body: BeautifulSoup(body, "html.parser")))
+        cases.append((f"{page.name}/html", size, lambda soup=soup, url=page.url: main.extract_tweet_data_from_html(soup, tweet_id, url)))
+        if "nitter" in page.url:
+            cases.append((f"{page.name}/nitter", size, lambda soup=soup, url=page.url: main.extract_tweet_data_from_nitter(soup, tweet_id, url)))
+    return cases
+
+
+CALIBRATION_PAGE = "".join(
+    f'<div class="tweet" data-id="{i}"><p>gm &amp; hello #{i} <a href="/u{i}">@u{i}</a></p></div>\n'
+    for i in range(200)
+)
+# Calls too fast for the timer are timed in batches of at least this long
+BATCH_SECONDS = 0.005
+# Cases faster than this share of the calibration loop (a few microseconds) are
+# too short to time reliably; only their peak memory is compared
+MIN_TIMED_RELATIVE = 0.005
+
+
+def calibration():
+    parser = html.parser.HTMLParser()
+    parser.feed(CALIBRATION_PAGE)
+    parser.close()
+
+
+def measure(func, min_runs: int, max_runs: int, budget: float) -> dict:
+    """Median and fastest wall time per call over repeated runs and peak traced memory of one call"""
+    start = time.perf_counter()
+    func()
+    number = max(1, int(BATCH_SECONDS / max(time.perf_counter() - start, 1e-9)))
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_runs and (len(timings) < min_runs or time.perf_counter() - started < budget):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": len(timings),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results: dict, baseline: dict, max_time_regression: float, max_memory_regression: float) -> list:
+    """Describe every case whose relative time or peak memory regressed past the threshold, or that has no baseline"""
+    failures = []
+    for case, current in results["cases"].items():
+        previous = baseline["cases"].get(case)
+        if not previous:
+            failures.append(f"{case}: not in the baseline")
+            continue
+        if previous["relative"] >= MIN_TIMED_RELATIVE and current["relative"] > previous["relative"] * (1 + max_time_regression):
+            failures.append(f"{case}: {previous['relative']}x -> {current['relative']}x the calibration loop "
+                            f"(fastest run {previous['min_ms']}ms -> {current['min_ms']}ms)")
+        if previous["peak_kb"] > 0 and current["peak_kb"] > previous["peak_kb"] * (1 + max_memory_regression):
+            failures.append(f"{case}: peak memory {previous['peak_kb']}KB -> {current['peak_kb']}KB")
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-runs", type=int, default=5)
+    parser.add_argument("--max-runs", type=int, default=50)
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds of timing runs per case")
+    parser.add_argument("--filter", default="", help="only run cases containing this substring")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--update-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--max-time-regression", type=float, default=0.25,
+                        help="allowed slowdown relative to the calibration loop (0.25 = 25%%)")
+    parser.add_argument("--max-memory-regression", type=float, default=0.10, help="allowed peak memory growth")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None) -> int:
+    args = parse_args(argv)
+    corpus = load_corpus()
+    tweet_id = CORPUS_TWEET_ID
+
+    selected = [(case, size, func) for case, size, func in benchmark_cases(corpus, tweet_id) if args.filter in case]
+    # The calibration loop runs between the cases, and each case is compared with
+    # the faster of its neighbours, so the machine's speed drifting during the run cancels out
+    calibrate = lambda: measure(calibration, args.min_runs, args.max_runs, args.budget / 4)["min_ms"]
+    calibrations, cases = [calibrate()], {}
+    for case, _, func in selected:
+        cases[case] = measure(func, args.min_runs, args.max_runs, args.budget)
+        calibrations.append(calibrate())
+    rows = []
+    for i, (case, size, _) in enumerate(selected):
+        cases[case]["relative"] = round(cases[case]["min_ms"] / min(calibrations[i], calibrations[i + 1]), 4)
+        rows.append({"case": case, "page_kb": round(size / 1024, 1), **cases[case]})
+    results = {"calibration_ms": round(min(calibrations), 3), "cases": cases}
+    print(format_table(rows, ["case", "page_kb", "runs", "median_ms", "min_ms", "relative", "peak_kb"]))
+    print(f"calibration loop: {results['calibration_ms']}ms")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update-baseline first")
+        return 1
+
+    failures = compare(results, json.loads(args.baseline.read_text()), args.max_time_regression, args.max_memory_regression)
+    for failure in failures:
+        print("REGRESSION", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
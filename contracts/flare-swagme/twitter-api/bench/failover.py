@@ -0,0 +1,122 @@
+"""Source failover check: an unreachable upstream host must not end a lookup.
+
+Runs the scraper in process against the stub upstreams, with chosen hosts
+sent to an unresolvable name (.invalid never resolves) instead of the stub,
+and checks that
+  - a full scrape whose first source cannot be resolved still verifies the
+    tweet from a later source, and the host's failure is recorded;
+  - mode=exists falls back to the nitter probe when oEmbed cannot be resolved;
+  - a connection that times out on one resolved address moves on to the next.
+Exits 1 when a check fails.
+
+    python bench/failover.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from harness import API_DIR, stub_upstreams, tweet_ids
+
+sys.path.insert(0, str(API_DIR))
+
+UNRESOLVABLE_SUFFIX = ".invalid"
+
+
+def route_hosts_to_nowhere(api, hosts: set):
+    """Make upstream_url send the given hosts to an unresolvable name, the rest to the stubs"""
+    original = api.upstream_url
+
+    def upstream_url(url: str) -> str:
+        host = url.split("://", 1)[-1].split("/", 1)[0].split("?", 1)[0]
+        if host in hosts:
+            return url.replace(host, host + UNRESOLVABLE_SUFFIX, 1)
+        return original(url)
+
+    api.upstream_url = upstream_url
+
+
+async def check_full_scrape(api, tweet_id: str) -> list:
+    failures = []
+    host = "cdn.syndication.twimg.com"
+    record = await api.scrape_tweet_from_twitter(tweet_id)
+    if not record.exists:
+        failures.append(f"full scrape: {host} unresolvable, later sources were not tried")
+    if api.source_timeouts.failures.get(host, 0) != 1:
+        failures.append(f"full scrape: expected one recorded failure for {host}, "
+                        f"got {api.source_timeouts.failures.get(host, 0)}")
+    return failures
+
+
+async def check_exists_probe(api, tweet_id: str) -> list:
+    try:
+        result = await api.check_tweet_exists(tweet_id)
+    except Exception as exc:
+        return [f"mode=exists: publish.twitter.com unresolvable, raised {type(exc).__name__}: {exc}"]
+    if result.get("source") != "nitter" or not result.get("exists"):
+        return [f"mode=exists: expected the nitter probe to answer, got {result}"]
+    return []
+
+
+async def check_address_fallback(api, upstream: str) -> list:
+    """First address of a host times out while connecting, the second is the stub"""
+    port = int(upstream.rsplit(":", 1)[1])
+    host = "two-addresses" + UNRESOLVABLE_SUFFIX
+    api.dns_cache.entries[(host, port)] = (["192.0.2.1", "127.0.0.1"], time.monotonic() + 3600)
+    backend = api.CachedDNSNetworkBackend()
+    inner = backend.backend.connect_tcp
+
+    async def connect_tcp(address, *args, **kwargs):
+        if address == "192.0.2.1":
+            raise api.httpcore.ConnectTimeout("timed out")
+        return await inner(address, *args, **kwargs)
+
+    backend.backend.connect_tcp = connect_tcp
+    try:
+        stream = await backend.connect_tcp(host, port, timeout=2.0)
+    except Exception as exc:
+        return [f"address fallback: raised {type(exc).__name__} instead of trying the next address"]
+    await stream.aclose()
+    return []
+
+
+async def run_checks(upstream: str) -> list:
+    import main as api
+    tweet_id, other_id = tweet_ids(2)
+    route_hosts_to_nowhere(api, {"cdn.syndication.twimg.com", "publish.twitter.com"})
+    try:
+        failures = await check_full_scrape(api, tweet_id)
+        failures += await check_exists_probe(api, other_id)
+        failures += await check_address_fallback(api, upstream)
+    finally:
+        await api.close_upstream_client()
+        await api.close_probe_client()
+    return failures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None) -> int:
+    parse_args(argv)
+    with stub_upstreams(["--latency-ms", "5"]) as upstream:
+        os.environ.update({
+            "UPSTREAM_OVERRIDE_URL": upstream,
+            "RESULT_CACHE_PATH": "",
+            "SCRAPE_DELAY_MIN": "0",
+            "SCRAPE_DELAY_MAX": "0",
+            "SCRAPE_TIMEOUT": "5",
+            "ADMISSION_MAX_ACTIVE": "0",
+        })
+        failures = asyncio.run(run_checks(upstream))
+    for failure in failures:
+        print("FAIL", failure)
+    print("OK" if not failures else f"{len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,133 @@
+"""Shared helpers for the offline benchmarks: process launchers and latency stats."""
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+API_DIR = BENCH_DIR.parent
+
+# First tweet ID handed out by tweet_ids(); a real-shaped Snowflake from mid 2025
+BASE_TWEET_ID = 1940801319423623380
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url: str, timeout: float = 30.0, process: subprocess.Popen = None):
+    """Poll url until it answers 200 or raise after timeout"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"process exited with code {process.returncode} before {url} was ready")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def stop(process: subprocess.Popen):
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+@contextmanager
+def stub_upstreams(stub_args=(), port: int = None):
+    """Run bench/stub_upstreams.py and yield its base URL"""
+    port = port or free_port()
+    process = subprocess.Popen(
+        [sys.executable, str(BENCH_DIR / "stub_upstreams.py"), "--port", str(port), *stub_args],
+        cwd=API_DIR,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(f"{base_url}/health", process=process)
+        yield base_url
+    finally:
+        stop(process)
+
+
+# Production launcher from the Dockerfile; takes its port from $PORT
+PRODUCTION_COMMAND = [sys.executable, "main.py"]
+
+
+@contextmanager
+def api_server(upstream_url: str, env: dict = None, server_args=(), port: int = None, command=None):
+    """Run the API against the stub upstreams and yield its base URL.
+
+    command replaces the default "python -m uvicorn main:app" launcher. The
+    port is passed as $PORT and, to uvicorn commands, as --port.
+    """
+    port = port or free_port()
+    process_env = dict(os.environ)
+    process_env.update({
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        "RESULT_CACHE_PATH": "",
+        "UPSTREAM_OVERRIDE_URL": upstream_url,
+        "SCRAPE_DELAY_MIN": "0",
+        "SCRAPE_DELAY_MAX": "0",
+        "SCRAPE_TIMEOUT": "5",
+    })
+    process_env.update(env or {})
+    command = list(command or [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--log-level", "warning"])
+    port_args = ["--port", str(port)] if "uvicorn" in command else []
+    process = subprocess.Popen([*command, *port_args, *server_args], cwd=API_DIR, env=process_env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(f"{base_url}/health", process=process)
+        yield base_url
+    finally:
+        stop(process)
+
+
+def tweet_ids(count: int, offset: int = 0) -> list:
+    return [str(BASE_TWEET_ID + (offset + i) * 4096) for i in range(count)]
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of values (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: list, elapsed: float, errors: int = 0) -> dict:
+    """Latency percentiles in milliseconds plus throughput for one run"""
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 2),
+    }
+
+
+def format_table(rows: list, columns: list) -> str:
+    """Render a list of dicts as a fixed-width text table"""
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns}
+    lines = ["  ".join(c.rjust(widths[c]) for c in columns)]
+    lines += ["  ".join(str(r.get(c, "")).rjust(widths[c]) for c in columns) for r in rows]
+    return "\n".join(lines)
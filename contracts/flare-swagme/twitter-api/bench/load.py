@@ -0,0 +1,215 @@
+"""Load generator for finding the API's saturation point against stub upstreams.
+
+Modes:
+  open   Poisson arrivals at a fixed rate (open loop: slow responses do not slow the sender)
+  burst  a block of simultaneous requests every interval, like verifiers in an FDC round
+  ramp   open-loop steps of increasing rate until the service saturates, then report the knee
+
+Tweet IDs are a mix of a small hot set (repeated verifications) and fresh IDs.
+The server is launched the way the Dockerfile or run.sh launches it, with a
+fresh result cache, so capacity numbers refer to what actually ships.
+
+    python bench/load.py ramp --start-rate 5 --step 1.5 --csv ramp.csv
+    python bench/load.py burst --burst-size 200 --bursts 5 --server-config runsh
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import shlex
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+import httpx
+
+from harness import PRODUCTION_COMMAND, api_server, format_table, percentile, stub_upstreams, summarize, tweet_ids
+
+# Launch commands as written in the Dockerfile and run.sh
+SERVER_CONFIGS = {
+    "docker": PRODUCTION_COMMAND,
+    "runsh": [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--reload"],
+}
+
+COLUMNS = ["offered_rps", "rps", "requests", "errors", "rejected", "p50_ms", "p95_ms", "p99_ms", "max_ms", "reject_p99_ms"]
+
+
+class TweetIdMix:
+    """Hands out hot IDs with probability repeat_ratio and otherwise never-seen IDs"""
+
+    def __init__(self, repeat_ratio: float, hot_ids: int, seed: int):
+        self.rng = random.Random(seed)
+        self.repeat_ratio = repeat_ratio
+        self.hot = tweet_ids(hot_ids)
+        self.next_unique = hot_ids
+
+    def __call__(self) -> str:
+        if self.hot and self.rng.random() < self.repeat_ratio:
+            return self.rng.choice(self.hot)
+        self.next_unique += 1
+        return tweet_ids(1, offset=self.next_unique)[0]
+
+
+async def timed_request(client: httpx.AsyncClient, tweet_id: str):
+    """(status code or None for a transport error, latency in seconds)"""
+    start = time.perf_counter()
+    try:
+        response = await client.get("/api/v1/verify-tweet", params={"url": tweet_id})
+    except httpx.HTTPError:
+        return None, time.perf_counter() - start
+    return response.status_code, time.perf_counter() - start
+
+
+def collect(results: list, elapsed: float, offered_rps: float) -> dict:
+    """Summary of successful requests; 503s from admission control count as rejected, not as errors"""
+    latencies = [latency for status, latency in results if status == 200]
+    rejected = [latency for status, latency in results if status == 503]
+    row = summarize(latencies, elapsed, errors=len(results) - len(latencies) - len(rejected))
+    row["requests"] = len(results)
+    row["rejected"] = len(rejected)
+    row["reject_p99_ms"] = round(percentile(rejected, 99) * 1000, 2)
+    row["offered_rps"] = round(offered_rps, 2)
+    return row
+
+
+async def open_loop(client, next_id, rate: float, duration: float, rng: random.Random) -> dict:
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    send_at = start
+    tasks = []
+    while True:
+        send_at += rng.expovariate(rate)
+        if send_at - start > duration:
+            break
+        await asyncio.sleep(max(0.0, send_at - loop.time()))
+        tasks.append(asyncio.create_task(timed_request(client, next_id())))
+    results = await asyncio.gather(*tasks)
+    return collect(results, loop.time() - start, rate)
+
+
+async def bursts(client, next_id, size: int, count: int, interval: float) -> list:
+    rows = []
+    for _ in range(count):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(timed_request(client, next_id()) for _ in range(size)))
+        elapsed = time.perf_counter() - start
+        rows.append(collect(results, elapsed, size / elapsed))
+        await asyncio.sleep(max(0.0, interval - elapsed))
+    return rows
+
+
+def is_saturated(row: dict, baseline_p99: float, args) -> bool:
+    return (row["rps"] < row["offered_rps"] * args.min_efficiency
+            or row["errors"] + row["rejected"] > row["requests"] * args.max_error_rate
+            or row["p99_ms"] > max(args.slo_ms, baseline_p99 * args.latency_blowup))
+
+
+def find_knee(rows: list, args) -> dict:
+    """Last ramp step before the service stopped keeping up with the offered load"""
+    knee = None
+    for row in rows:
+        if is_saturated(row, rows[0]["p99_ms"], args):
+            break
+        knee = row
+    return knee
+
+
+async def ramp(client, next_id, args, rng: random.Random) -> list:
+    rows, rate = [], args.start_rate
+    while rate <= args.max_rate:
+        row = await open_loop(client, next_id, rate, args.step_duration, rng)
+        rows.append(row)
+        print(format_table([row], COLUMNS), flush=True)
+        if is_saturated(row, rows[0]["p99_ms"], args) and len(rows) > 1:
+            break
+        rate *= args.step
+    return rows
+
+
+async def run(base_url: str, args) -> list:
+    rng = random.Random(args.seed)
+    next_id = TweetIdMix(args.repeat_ratio, args.hot_ids, args.seed)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=args.keepalive)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        if args.mode == "open":
+            return [await open_loop(client, next_id, args.rate, args.duration, rng)]
+        if args.mode == "burst":
+            return await bursts(client, next_id, args.burst_size, args.bursts, args.burst_interval)
+        return await ramp(client, next_id, args, rng)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["open", "burst", "ramp"])
+    parser.add_argument("--rate", type=float, default=20.0, help="open: arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="open: seconds of load")
+    parser.add_argument("--burst-size", type=int, default=100, help="burst: simultaneous requests per round")
+    parser.add_argument("--bursts", type=int, default=5, help="burst: number of rounds")
+    parser.add_argument("--burst-interval", type=float, default=15.0, help="burst: seconds between round starts")
+    parser.add_argument("--start-rate", type=float, default=5.0, help="ramp: first step rate")
+    parser.add_argument("--step", type=float, default=1.5, help="ramp: rate multiplier per step")
+    parser.add_argument("--max-rate", type=float, default=2000.0, help="ramp: stop after this rate")
+    parser.add_argument("--step-duration", type=float, default=15.0, help="ramp: seconds per step")
+    parser.add_argument("--slo-ms", type=float, default=10000.0, help="ramp: p99 above this is saturated")
+    parser.add_argument("--latency-blowup", type=float, default=3.0, help="ramp: p99 growth over the first step that counts as saturated")
+    parser.add_argument("--min-efficiency", type=float, default=0.9, help="ramp: achieved/offered rate below this is saturated")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--repeat-ratio", type=float, default=0.5, help="share of requests for already-seen tweet IDs")
+    parser.add_argument("--hot-ids", type=int, default=50, help="size of the repeated tweet ID set")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--keepalive", type=int, default=100, help="client keep-alive connections")
+    parser.add_argument("--server-config", choices=sorted(SERVER_CONFIGS), default="docker")
+    parser.add_argument("--workers", type=int, default=0, help="docker: WEB_CONCURRENCY (0 = one per CPU)")
+    parser.add_argument("--server-args", default="", help="extra arguments for the runsh uvicorn command")
+    parser.add_argument("--stub-args", default="", help="extra arguments for stub_upstreams.py")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra environment for the API, e.g. --env ADMISSION_MAX_ACTIVE=8")
+    parser.add_argument("--target", help="load an already running API instead of starting one")
+    parser.add_argument("--json", dest="json_path")
+    parser.add_argument("--csv", dest="csv_path", help="write the latency-vs-throughput curve as CSV")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with ExitStack() as stack:
+        base_url = args.target
+        if not base_url:
+            cache_dir = stack.enter_context(tempfile.TemporaryDirectory())
+            env = {"RESULT_CACHE_PATH": os.path.join(cache_dir, "tweets.sqlite3")}
+            if args.workers:
+                env["WEB_CONCURRENCY"] = str(args.workers)
+            env.update(item.split("=", 1) for item in args.env)
+            upstream = stack.enter_context(stub_upstreams(shlex.split(args.stub_args)))
+            base_url = stack.enter_context(api_server(
+                upstream, env=env, command=SERVER_CONFIGS[args.server_config], server_args=shlex.split(args.server_args)))
+        rows = asyncio.run(run(base_url, args))
+
+    print()
+    print(format_table(rows, COLUMNS))
+    report = {"mode": args.mode, "server_config": args.server_config, "rows": rows}
+    if args.mode == "ramp":
+        knee = find_knee(rows, args)
+        report["knee"] = knee
+        if knee:
+            print(f"\nknee: {knee['rps']} req/s sustained at p99 {knee['p99_ms']}ms (offered {knee['offered_rps']} req/s)")
+        else:
+            print("\nknee: saturated at the first step; lower --start-rate")
+
+    if args.csv_path:
+        with open(args.csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
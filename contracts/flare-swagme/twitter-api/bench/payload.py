@@ -0,0 +1,157 @@
+"""Response size and serialization cost of the tweet endpoints.
+
+Starts the stub upstreams and the API, fills the result cache, then fetches
+cached tweets through /api/v1/verify-tweet and /api/v1/tweets/{id} in full,
+with fields= (what FDC's post-process jq reads) and with compact=true, once
+per Accept-Encoding. Reports bytes on the wire and p50 latency per variant,
+then times serialization of one response in process: the FastAPI response
+path used before (validation and jsonable_encoder) against main.py's direct
+serialization.
+
+    python bench/payload.py
+    python bench/payload.py --tweets 200 --rounds 5 --json payload.json
+    python bench/payload.py --env COMPRESSION_MIN_BYTES=0   # compress every body
+"""
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+import httpx
+
+from harness import API_DIR, api_server, format_table, percentile, stub_upstreams, tweet_ids
+
+sys.path.insert(0, str(API_DIR))
+
+VARIANTS = {
+    "verify": ("/api/v1/verify-tweet", {}),
+    "verify fields=data": ("/api/v1/verify-tweet", {"fields": "data"}),
+    "verify fields=verified": ("/api/v1/verify-tweet", {"fields": "verified"}),
+    "verify compact": ("/api/v1/verify-tweet", {"compact": "true"}),
+    "tweets": ("/api/v1/tweets/{id}", {}),
+    "tweets compact": ("/api/v1/tweets/{id}", {"compact": "true"}),
+}
+COLUMNS = ["variant", "encoding", "wire_bytes", "body_bytes", "p50_ms"]
+
+
+async def fetch_variant(client: httpx.AsyncClient, ids: list, path: str, params: dict, encoding: str, rounds: int) -> dict:
+    wire, body, latencies = [], [], []
+    for _ in range(rounds):
+        for tweet_id in ids:
+            request_params = dict(params)
+            if "{id}" not in path:
+                request_params["url"] = tweet_id
+            start = time.perf_counter()
+            response = await client.get(path.format(id=tweet_id), params=request_params, headers={"Accept-Encoding": encoding})
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+            wire.append(response.num_bytes_downloaded)
+            body.append(len(response.content))
+    return {
+        "wire_bytes": round(statistics.mean(wire), 1),
+        "body_bytes": round(statistics.mean(body), 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+    }
+
+
+async def measure_wire(base_url: str, ids: list, encodings: list, rounds: int) -> list:
+    rows = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        for tweet_id in ids:
+            (await client.get("/api/v1/verify-tweet", params={"url": tweet_id})).raise_for_status()
+        for variant, (path, params) in VARIANTS.items():
+            for encoding in encodings:
+                row = {"variant": variant, "encoding": encoding, **await fetch_variant(client, ids, path, params, encoding, rounds)}
+                rows.append(row)
+                print(format_table([row], COLUMNS), flush=True)
+    return rows
+
+
+def time_call(call, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1e6, 1)
+
+
+def measure_serialization(runs: int) -> list:
+    import main
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+
+    tweets_route = next(route for route in main.app.routes if getattr(route, "path", "") == "/api/v1/tweets/{tweet_id}")
+    tweet_data = main.TweetData(
+        tweetId="1940801319423623380", authorUsername="swagme_test", tweetText="gm " * 80,
+        createdAt=main.snowflake_created_at("1940801319423623380"), exists=True, timestamp=1751500000,
+    )
+    payload = lambda: {
+        "verified": True, "tweet_id": tweet_data.tweetId, "created_at": tweet_data.createdAt,
+        "data": tweet_data, "message": "Tweet verified successfully",
+    }
+
+    def fastapi_path(content, field=None):
+        return JSONResponse(asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=True)))
+
+    # asyncio.run's own cost is timed separately and subtracted from the FastAPI path
+    loop_us = time_call(lambda: asyncio.run(asyncio.sleep(0)), runs)
+    cases = {
+        "verify": (lambda: fastapi_path(payload()), lambda: main.verify_response(payload(), None)),
+        "verify fields=data": (None, lambda: main.verify_response(payload(), ["data"])),
+        "verify compact": (None, lambda: main.verify_response(payload(), main.COMPACT_VERIFY_FIELDS)),
+        "tweets": (lambda: fastapi_path(tweet_data, tweets_route.response_field), lambda: main.tweet_response(tweet_data, None)),
+        "tweets compact": (None, lambda: main.tweet_response(tweet_data, main.COMPACT_TWEET_FIELDS)),
+    }
+    rows = []
+    for case, (before, after) in cases.items():
+        rows.append({
+            "case": case,
+            "fastapi_us": round(time_call(before, runs) - loop_us, 1) if before else "",
+            "direct_us": time_call(after, runs),
+        })
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tweets", type=int, default=50, help="cached tweets fetched per variant and round")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--encodings", nargs="+", default=["identity", "gzip", "br"], help="Accept-Encoding values to send")
+    parser.add_argument("--serialization-runs", type=int, default=2000)
+    parser.add_argument("--stub-args", default="", help="extra arguments for stub_upstreams.py")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra environment for the API, e.g. --env COMPRESSION_MIN_BYTES=0")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    with ExitStack() as stack:
+        cache_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        env = {"RESULT_CACHE_PATH": os.path.join(cache_dir, "tweets.sqlite3")}
+        env.update(item.split("=", 1) for item in args.env)
+        upstream = stack.enter_context(stub_upstreams(shlex.split(args.stub_args)))
+        base_url = stack.enter_context(api_server(upstream, env=env))
+        wire = asyncio.run(measure_wire(base_url, tweet_ids(args.tweets), args.encodings, args.rounds))
+
+    serialization = measure_serialization(args.serialization_runs)
+    print()
+    print(format_table(wire, COLUMNS))
+    print()
+    print(format_table(serialization, ["case", "fastapi_us", "direct_us"]))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"wire": wire, "serialization": serialization}, f, indent=2)
+    return wire, serialization
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,102 @@
+"""Priority lane check: FDC fetches under a flood of batch and interactive traffic.
+
+Starts one API worker with a small admission limit against slow stub
+upstreams. Batch clients (X-Request-Class: batch) keep the scraper saturated
+with fresh IDs while FDC verifiers call /api/v1/verify-tweet and a dashboard
+polls /api/v1/tweets/{id} at a steady rate. Reports latency per lane and fails
+(exit 1) when FDC p99 exceeds --fdc-slo-ms.
+
+    python bench/priority.py
+    python bench/priority.py --max-active 4 --batch-clients 64 --latency-ms 500
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+from harness import PRODUCTION_COMMAND, api_server, format_table, stub_upstreams, summarize, tweet_ids
+
+COLUMNS = ["lane", "requests", "errors", "rejected", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+
+
+async def run(base_url: str, args) -> list:
+    fresh_ids = iter(tweet_ids(10**6))
+    stop_at = time.perf_counter() + args.duration
+    results = {"fdc": [], "interactive": [], "batch": []}
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0,
+                                 limits=httpx.Limits(max_connections=None)) as client:
+        async def call(lane: str, path: str, params: dict, headers: dict):
+            start = time.perf_counter()
+            try:
+                response = await client.get(path, params=params, headers=headers)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            results[lane].append((status, time.perf_counter() - start))
+
+        async def batch_client():
+            while time.perf_counter() < stop_at:
+                await call("batch", "/api/v1/verify-tweet", {"url": next(fresh_ids)}, {"X-Request-Class": "batch"})
+                if results["batch"][-1][0] == 503:
+                    await asyncio.sleep(0.05)
+
+        async def steady(lane: str, rate: float):
+            tasks = []
+            while time.perf_counter() < stop_at:
+                tweet_id = next(fresh_ids)
+                if lane == "fdc":
+                    tasks.append(asyncio.create_task(call(lane, "/api/v1/verify-tweet", {"url": tweet_id}, {})))
+                else:
+                    tasks.append(asyncio.create_task(call(lane, f"/api/v1/tweets/{tweet_id}", {}, {})))
+                await asyncio.sleep(1 / rate)
+            await asyncio.gather(*tasks)
+
+        batch = [asyncio.create_task(batch_client()) for _ in range(args.batch_clients)]
+        await asyncio.sleep(args.warmup)
+        await asyncio.gather(steady("fdc", args.fdc_rate), steady("interactive", args.interactive_rate), *batch)
+
+    rows = []
+    for lane, samples in results.items():
+        ok = [latency for status, latency in samples if status == 200]
+        rejected = sum(status == 503 for status, _ in samples)
+        row = summarize(ok, args.duration, errors=len(samples) - len(ok) - rejected)
+        rows.append({"lane": lane, **row, "requests": len(samples), "rejected": rejected})
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of batch-only load before measuring")
+    parser.add_argument("--max-active", type=int, default=4, help="ADMISSION_MAX_ACTIVE for the API")
+    parser.add_argument("--batch-clients", type=int, default=32)
+    parser.add_argument("--fdc-rate", type=float, default=2.0, help="FDC requests per second")
+    parser.add_argument("--interactive-rate", type=float, default=2.0, help="dashboard requests per second")
+    parser.add_argument("--latency-ms", type=int, default=300, help="stub upstream latency")
+    parser.add_argument("--fdc-slo-ms", type=float, default=2000.0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    env = {"WEB_CONCURRENCY": "1", "ADMISSION_MAX_ACTIVE": str(args.max_active)}
+    with stub_upstreams(["--latency-ms", str(args.latency_ms)]) as upstream, \
+            api_server(upstream, env=env, command=PRODUCTION_COMMAND) as base_url:
+        rows = asyncio.run(run(base_url, args))
+        admission = httpx.get(f"{base_url}/api/v1/status").json()["admission"]
+
+    print(format_table(rows, COLUMNS))
+    print("admission:", {lane: {k: v for k, v in stats.items() if k != "weight"} for lane, stats in admission["lanes"].items()})
+    fdc = rows[0]
+    if fdc["errors"] or fdc["rejected"] or fdc["p99_ms"] > args.fdc_slo_ms:
+        print(f"FAIL: FDC p99 {fdc['p99_ms']}ms (SLO {args.fdc_slo_ms}ms), {fdc['errors']} errors, {fdc['rejected']} rejected")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
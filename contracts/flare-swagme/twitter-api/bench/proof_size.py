@@ -0,0 +1,114 @@
+"""Web2Json payload size and estimated gas: full TweetData vs TweetCommitment.
+
+ABI-encodes the attested struct of both proof modes (the abiSignature tuples
+in flare/scripts/fdcDeploy.ts) for tweets of growing text length and
+estimates what SwagFormProofManager pays for it: calldata gas for the
+encoded response (16 per non-zero byte, 4 per zero byte) and storage gas for
+the non-zero slots verifyTweetData / verifyTweetCommitment write (22100 per
+new slot). Estimates only; nothing runs on chain.
+
+    python bench/proof_size.py
+    python bench/proof_size.py --lengths 0 280 4000 25000 --json proof_size.json
+"""
+import argparse
+import json
+import random
+import string
+import sys
+
+from harness import API_DIR, format_table
+
+sys.path.insert(0, str(API_DIR))
+import main  # noqa: E402
+
+TWEET_ID = "1940801319423623380"
+AUTHOR = "FlareNetworks"
+CREATED_AT = main.snowflake_created_at(TWEET_ID)
+TIMESTAMP = 1751557000
+NEW_SLOT_GAS = 22100
+COLUMNS = ["text_chars", "mode", "abi_bytes", "calldata_gas", "slots", "storage_gas", "total_gas"]
+
+
+def word(value: int) -> bytes:
+    return value.to_bytes(32, "big")
+
+
+def encode_string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return word(len(data)) + data + bytes(-len(data) % 32)
+
+
+def encode_tuple(values: list) -> bytes:
+    """abi.encode of one dynamic tuple of string / bytes32 / bool / uint256 members"""
+    head, tail = b"", b""
+    head_size = 32 * len(values)
+    for value in values:
+        if isinstance(value, str):
+            head += word(head_size + len(tail))
+            tail += encode_string(value)
+        elif isinstance(value, bytes):
+            head += value
+        else:
+            head += word(int(value))
+    return word(32) + head + tail
+
+
+def string_slots(value: str) -> int:
+    """Non-zero storage slots of a string: one, plus its data slots when it is 32 bytes or longer"""
+    size = len(value.encode("utf-8"))
+    if size == 0:
+        return 0
+    return 1 if size < 32 else 1 + -(-size // 32)
+
+
+def calldata_gas(data: bytes) -> int:
+    zeros = data.count(0)
+    return 4 * zeros + 16 * (len(data) - zeros)
+
+
+def measure(text: str) -> list:
+    content_hash, _ = main.content_commitment(AUTHOR, text)
+    full = encode_tuple([TWEET_ID, AUTHOR, text, CREATED_AT, True, TIMESTAMP])
+    commitment = encode_tuple([TWEET_ID, bytes.fromhex(content_hash[2:]), True, TIMESTAMP])
+    # TweetData: four strings, exists, timestamp and verified; commitments add tweetContentHash
+    full_slots = sum(string_slots(value) for value in (TWEET_ID, AUTHOR, text, CREATED_AT)) + 3
+    commitment_slots = string_slots(TWEET_ID) + 3 + 1
+    rows = []
+    for mode, encoded, slots in (("full", full, full_slots), ("commitment", commitment, commitment_slots)):
+        rows.append({
+            "text_chars": len(text),
+            "mode": mode,
+            "abi_bytes": len(encoded),
+            "calldata_gas": calldata_gas(encoded),
+            "slots": slots,
+            "storage_gas": slots * NEW_SLOT_GAS,
+            "total_gas": calldata_gas(encoded) + slots * NEW_SLOT_GAS,
+        })
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[0, 50, 140, 280, 1000, 4000],
+                        help="tweet text lengths in characters")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path", help="also write the rows to this file")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    alphabet = string.ascii_letters + string.digits + "      #@"
+    rows = []
+    for length in args.lengths:
+        rows.extend(measure("".join(rng.choice(alphabet) for _ in range(length))))
+    print(format_table(rows, COLUMNS))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,65 @@
+"""Throughput and latency per runtime profile (RUNTIME_PROFILE in main.py).
+
+Starts the production launcher once per profile against the same stub
+upstreams and drives verify-tweet with the e2e client: once with unique tweet
+IDs (every request scrapes, so outbound HTTP dominates) and once with a small
+repeated set (cache hits, so inbound HTTP and JSON dominate).
+
+    python bench/runtime.py
+    python bench/runtime.py --profiles asyncio fast --workers 2 --requests 2000 --json runtime.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import tempfile
+
+from e2e import drive
+from harness import PRODUCTION_COMMAND, api_server, format_table, stub_upstreams, tweet_ids
+
+COLUMNS = ["profile", "ids", "requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms"]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", default=["asyncio", "fast"])
+    parser.add_argument("--workers", type=int, default=1, help="WEB_CONCURRENCY for every profile")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--repeated-ids", type=int, default=20, help="distinct IDs in the repeated pass")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--stub-args", default="", help="extra arguments for stub_upstreams.py")
+    parser.add_argument("--json", dest="json_path", help="also write the rows to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = []
+    with stub_upstreams(shlex.split(args.stub_args)) as upstream:
+        for index, profile in enumerate(args.profiles):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                env = {
+                    "RUNTIME_PROFILE": profile,
+                    "WEB_CONCURRENCY": str(args.workers),
+                    "RESULT_CACHE_PATH": os.path.join(cache_dir, "tweets.sqlite3"),
+                }
+                with api_server(upstream, env=env, command=PRODUCTION_COMMAND) as base_url:
+                    for pass_name, ids in (("unique", tweet_ids(args.requests, offset=(index + 1) * 10**6)),
+                                           ("repeated", tweet_ids(args.repeated_ids))):
+                        row = asyncio.run(drive(base_url, ids, args.requests, args.concurrency, args.timeout))
+                        row.update({"profile": profile, "ids": pass_name})
+                        rows.append(row)
+                        print(format_table([row], COLUMNS), flush=True)
+
+    print()
+    print(format_table(rows, COLUMNS))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Throughput vs worker count for the production launch mode (python main.py).
+
+For each worker count the API is started with WEB_CONCURRENCY workers and a
+fresh shared result cache, then driven twice with the e2e client: once with
+unique tweet IDs (every request scrapes) and once with a small repeated set
+(requests are answered from the cache other workers filled).
+
+    python bench/scaling.py --workers 1 2 4 --requests 1000 --concurrency 100
+"""
+import argparse
+import asyncio
+import os
+import shlex
+import tempfile
+
+from e2e import drive
+from harness import PRODUCTION_COMMAND, api_server, format_table, stub_upstreams, tweet_ids
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--repeated-ids", type=int, default=20, help="distinct IDs in the repeated pass")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--stub-args", default="", help="extra arguments for stub_upstreams.py")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = []
+    with stub_upstreams(shlex.split(args.stub_args)) as upstream:
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                env = {"WEB_CONCURRENCY": str(workers), "RESULT_CACHE_PATH": os.path.join(cache_dir, "tweets.sqlite3")}
+                with api_server(upstream, env=env, command=PRODUCTION_COMMAND) as base_url:
+                    for pass_name, ids in (("unique", tweet_ids(args.requests, offset=workers * 10**6)),
+                                           ("repeated", tweet_ids(args.repeated_ids))):
+                        row = asyncio.run(drive(base_url, ids, args.requests, args.concurrency, args.timeout))
+                        row.update({"workers": workers, "ids": pass_name})
+                        rows.append(row)
+                        print(format_table([row], ["workers", "ids", "rps", "p50_ms", "p99_ms", "errors"]), flush=True)
+
+    print()
+    print(format_table(rows, ["workers", "ids", "requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms"]))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Cold-start cost of the API: import time and time to the first responses.
+
+Measures, over several fresh processes:
+  import_ms        python -c "import main" (module import only)
+  first_health_ms  process spawn to the first 200 from /health (production launcher, one worker)
+  first_verify_ms  the first verify-tweet after that (--first-request-delay later), a scrape
+                   against the stub upstreams; it must come back verified
+
+with and without the post-startup warm-up (WARM_UP).
+
+    python bench/startup.py
+    python bench/startup.py --runs 10 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from harness import API_DIR, PRODUCTION_COMMAND, format_table, free_port, stop, stub_upstreams, tweet_ids
+
+IMPORT_SNIPPET = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+COLUMNS = ["warm_up", "runs", "import_ms", "first_health_ms", "first_verify_ms"]
+
+
+def import_seconds() -> float:
+    env = dict(os.environ, RESULT_CACHE_PATH="")
+    output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=API_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def first_responses(upstream: str, warm_up: bool, tweet_id: str, delay: float) -> tuple:
+    """(seconds to the first /health 200, seconds for the first verify-tweet) of a fresh server"""
+    port = free_port()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ)
+        env.update({
+            "PORT": str(port),
+            "HOST": "127.0.0.1",
+            "WEB_CONCURRENCY": "1",
+            "WARM_UP": "1" if warm_up else "0",
+            "RESULT_CACHE_PATH": os.path.join(cache_dir, "tweets.sqlite3"),
+            "UPSTREAM_OVERRIDE_URL": upstream,
+            "SCRAPE_DELAY_MIN": "0",
+            "SCRAPE_DELAY_MAX": "0",
+        })
+        base_url = f"http://127.0.0.1:{port}"
+        start = time.perf_counter()
+        process = subprocess.Popen(PRODUCTION_COMMAND, cwd=API_DIR, env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"server exited with code {process.returncode}")
+                try:
+                    if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    time.sleep(0.005)
+            health = time.perf_counter() - start
+            time.sleep(delay)
+            start = time.perf_counter()
+            response = httpx.get(f"{base_url}/api/v1/verify-tweet", params={"url": tweet_id}, timeout=30.0)
+            response.raise_for_status()
+            if not response.json()["verified"]:
+                raise RuntimeError(f"first verification of {tweet_id} failed: {response.text[:200]}")
+            return health, time.perf_counter() - start
+        finally:
+            stop(process)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per measurement")
+    parser.add_argument("--first-request-delay", type=float, default=0.0,
+                        help="seconds between the first /health and the first verification")
+    parser.add_argument("--stub-args", default="", help="extra arguments for stub_upstreams.py")
+    parser.add_argument("--json", dest="json_path", help="also write the rows to this file")
+    return parser.parse_args(argv)
+
+
+def median_ms(values: list) -> float:
+    return round(statistics.median(values) * 1000, 1)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    imports = [import_seconds() for _ in range(args.runs)]
+    rows = []
+    with stub_upstreams(args.stub_args.split()) as upstream:
+        for warm_up in (False, True):
+            runs = [first_responses(upstream, warm_up, tweet_id, args.first_request_delay) for tweet_id in tweet_ids(args.runs)]
+            rows.append({
+                "warm_up": warm_up,
+                "runs": args.runs,
+                "import_ms": median_ms(imports),
+                "first_health_ms": median_ms([health for health, _ in runs]),
+                "first_verify_ms": median_ms([verify for _, verify in runs]),
+            })
+            print(format_table([rows[-1]], COLUMNS), flush=True)
+
+    print()
+    print(format_table(rows, COLUMNS))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Local stub server impersonating every upstream host used by the scraper.
+
+The API is pointed at this server with UPSTREAM_OVERRIDE_URL, which turns
+https://nitter.net/i/status/123 into http://127.0.0.1:<port>/nitter.net/i/status/123.
+Each host serves a page from bench/fixtures with {{TWEET_ID}} substituted.
+api.x.com implements the guest flow: POST 1.1/guest/activate.json hands out a
+guest token and the GraphQL tweet lookup answers 403 without a live one.
+Pages are gzip- or brotli-compressed in turn when the client accepts it, as
+the real hosts do (--encodings identity serves them as is).
+GET /stats reports how many upstream requests the stub has answered.
+
+    python bench/stub_upstreams.py --port 9100 --latency-ms 80 --rate-404 0.1
+"""
+import argparse
+import asyncio
+import gzip
+import random
+import re
+from pathlib import Path
+from urllib.parse import unquote
+
+import brotli
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# Host -> (fixture file, content type); hosts not listed answer 404
+HOST_FIXTURES = {
+    "cdn.syndication.twimg.com": ("tweet_result.json", "application/json; charset=utf-8"),
+    "nitter.net": ("nitter_status.html", "text/html; charset=utf-8"),
+    "nitter.poast.org": ("nitter_status.html", "text/html; charset=utf-8"),
+    "nitter.privacydev.net": ("nitter_status.html", "text/html; charset=utf-8"),
+    "publish.twitter.com": ("oembed.json", "application/json; charset=utf-8"),
+    "syndication.twitter.com": ("syndication_timeline.json", "application/json; charset=utf-8"),
+    "api.x.com": ("x_tweet_result.json", "application/json; charset=utf-8"),
+    "x.com": ("x_status.html", "text/html; charset=utf-8"),
+    "twitter.com": ("x_status.html", "text/html; charset=utf-8"),
+}
+
+TWEET_ID_PATTERN = re.compile(r'(?:status/|tweet_id=|statuses/show/|[?&]id=|"tweetId":")(\d+)')
+BAD_GUEST_TOKEN = '{"errors":[{"code":239,"message":"Bad guest token."}]}'
+
+
+
+ENCODERS = {"gzip": gzip.compress, "br": brotli.compress, "identity": None}
+
+
+def load_fixtures() -> dict:
+    return {name: (FIXTURES_DIR / name).read_text() for name, _ in HOST_FIXTURES.values()}
+
+
+def encoded_response(body: str, content_type: str, encoding: str) -> Response:
+    encoder = ENCODERS[encoding]
+    if encoder is None:
+        return Response(body, media_type=content_type)
+    return Response(encoder(body.encode()), media_type=content_type, headers={"Content-Encoding": encoding})
+
+
+def create_app(args) -> Starlette:
+    fixtures = load_fixtures()
+    fail_hosts = set(filter(None, args.fail_hosts.split(",")))
+    hang_hosts = set(filter(None, args.hang_hosts.split(",")))
+    encodings = [encoding for encoding in args.encodings.split(",") if encoding in ENCODERS]
+    stats = {"requests": 0, "tweet_ids": set(), "guest_activations": 0}
+    # Guest token -> lookups left (None = unlimited)
+    guest_tokens = {}
+
+    async def upstream(request: Request) -> Response:
+        host = request.path_params["host"]
+        path = request.path_params["path"] + "?" + unquote(request.url.query)
+        stats["requests"] += 1
+
+        if args.latency_ms or args.jitter_ms:
+            await asyncio.sleep(max(0.0, random.gauss(args.latency_ms, args.jitter_ms)) / 1000)
+
+        roll = random.random()
+        if roll < args.rate_timeout or host in hang_hosts:
+            await asyncio.sleep(args.timeout_sleep)
+            return Response(status_code=504)
+        roll -= args.rate_timeout
+        if roll < args.rate_429:
+            return Response('{"errors":[{"code":88,"message":"Rate limit exceeded"}]}', status_code=429, media_type="application/json")
+        roll -= args.rate_429
+        if roll < args.rate_404 or host in fail_hosts or host not in HOST_FIXTURES:
+            return Response("Not Found", status_code=404, media_type="text/plain")
+
+        if host == "api.x.com":
+            if path.startswith("1.1/guest/activate.json"):
+                if request.method != "POST" or not request.headers.get("authorization", "").startswith("Bearer "):
+                    return Response('{"errors":[{"code":215}]}', status_code=401, media_type="application/json")
+                stats["guest_activations"] += 1
+                token = str(random.randrange(10**18, 10**19))
+                guest_tokens[token] = args.guest_token_uses or None
+                return JSONResponse({"guest_token": token})
+            token = request.headers.get("x-guest-token")
+            if token not in guest_tokens or guest_tokens[token] == 0:
+                return Response(BAD_GUEST_TOKEN, status_code=403, media_type="application/json")
+            if guest_tokens[token] is not None:
+                guest_tokens[token] -= 1
+
+        match = TWEET_ID_PATTERN.search(path)
+        if not match:
+            return Response("Not Found", status_code=404, media_type="text/plain")
+        stats["tweet_ids"].add(match.group(1))
+
+        fixture, content_type = HOST_FIXTURES[host]
+        accepted = request.headers.get("accept-encoding", "")
+        offered = [encoding for encoding in encodings if encoding == "identity" or encoding in accepted]
+        encoding = offered[stats["requests"] % len(offered)] if offered else "identity"
+        return encoded_response(fixtures[fixture].replace("{{TWEET_ID}}", match.group(1)), content_type, encoding)
+
+    async def health(request: Request) -> Response:
+        return Response("ok")
+
+    async def get_stats(request: Request) -> JSONResponse:
+        return JSONResponse({"requests": stats["requests"], "unique_tweets": len(stats["tweet_ids"]),
+                             "guest_activations": stats["guest_activations"]})
+
+    return Starlette(routes=[
+        Route("/health", health),
+        Route("/stats", get_stats),
+        Route("/{host}/{path:path}", upstream, methods=["GET", "POST"]),
+    ])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stub upstream hosts for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="latency standard deviation")
+    parser.add_argument("--rate-404", type=float, default=0.0, help="share of requests answered 404")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of requests answered 429")
+    parser.add_argument("--rate-timeout", type=float, default=0.0, help="share of requests that hang")
+    parser.add_argument("--timeout-sleep", type=float, default=60.0, help="seconds a hanging request sleeps")
+    parser.add_argument("--fail-hosts", default="", help="comma separated hosts that always answer 404")
+    parser.add_argument("--hang-hosts", default="", help="comma separated hosts that never answer in time")
+    parser.add_argument("--encodings", default="gzip,br,identity",
+                        help="content encodings served in turn to clients that accept them")
+    parser.add_argument("--guest-token-uses", type=int, default=0, help="lookups before a guest token is revoked (0 = never)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
@@ -1,16 +1,65 @@
-from fastapi import FastAPI, HTTPException
+from __future__ import annotations
+from fastapi import FastAPI, HTTPException, Request, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response
+from starlette.datastructures import MutableHeaders
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import datetime, timezone
 import re
 import os
-import httpx
 import asyncio
 from typing import Optional
-from bs4 import BeautifulSoup
+from urllib.parse import urlencode, urlparse
 import json
 import random
 import time
+import cProfile
+import tracemalloc
+import resource
+import secrets
+import sqlite3
+import threading
+import hashlib
+import bisect
+import math
+import collections
+import contextlib
+import html
+import unicodedata
+import zlib
+import gzip
+import socket
+import ipaddress
+import http.cookiejar
+import importlib
+import importlib.util
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access.
+    
+    Unlike importlib.util.LazyLoader this is safe when the warm-up thread and
+    a request touch the module at the same time: the first import holds a lock.
+    """
+    
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+    
+    def __getattr__(self, attr: str):
+        module = self._module
+        if module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+                module = self._module
+        return getattr(module, attr)
+
+# The HTTP client and HTML parser are a fifth of the import time of this module;
+# they load on first use or in the warm-up after the server is listening
+httpx = LazyModule("httpx")
+httpcore = LazyModule("httpcore")
+bs4 = LazyModule("bs4")
 
 app = FastAPI(
     title="SwagForm Twitter Verification API",
@@ -35,9 +84,784 @@ class TweetData(BaseModel):
     exists: bool
     timestamp: int
 
+class TweetRecord:
+    """Result inside the scraping pipeline: a plain slotted object, so the many
+    candidates extractors build and drop cost no validation. It becomes a
+    TweetData once, when a fetch hands its result to the cache and the API.
+    
+    author_confirmed marks authors the source reported in its own content
+    (not guessed from a page); only those are taught to the author index.
+    """
+    
+    __slots__ = ("tweetId", "authorUsername", "tweetText", "createdAt", "exists", "timestamp", "author_confirmed")
+    
+    def __init__(self, tweetId: str, authorUsername: str, tweetText: str, createdAt: str, exists: bool, timestamp: int,
+                 author_confirmed: bool = False):
+        self.tweetId = tweetId
+        self.authorUsername = authorUsername
+        self.tweetText = tweetText
+        self.createdAt = createdAt
+        self.exists = exists
+        self.timestamp = timestamp
+        self.author_confirmed = author_confirmed
+    
+    def to_model(self) -> TweetData:
+        return TweetData(
+            tweetId=self.tweetId,
+            authorUsername=self.authorUsername,
+            tweetText=self.tweetText,
+            createdAt=self.createdAt,
+            exists=self.exists,
+            timestamp=self.timestamp
+        )
+
+class TweetCommitment(BaseModel):
+    """Constant-size proof form of a tweet: its author and text only as a keccak256 commitment"""
+    tweetId: str
+    contentHash: str
+    exists: bool
+    timestamp: int
+
+# Response compression: gzip, or brotli when the brotli package is installed,
+# whichever the client's Accept-Encoding prefers. Bodies under
+# COMPRESSION_MIN_BYTES (most verify-tweet answers with fields= or compact=true)
+# are sent as they are, since the encoding would cost more than it saves.
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "1") != "0"
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "512"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+brotli = LazyModule("brotli") if importlib.util.find_spec("brotli") else None
+# In order of preference when the client rates them equally
+COMPRESSION_ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+compression_stats = {"compressed": 0, "skipped_small": 0, "bytes_in": 0, "bytes_out": 0}
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """The supported encoding the client prefers by its Accept-Encoding q-values; None for identity"""
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip()] = weight
+    accepted = [e for e in COMPRESSION_ENCODINGS if weights.get(e, weights.get("*", 0.0)) > 0]
+    return max(accepted, key=lambda e: weights.get(e, weights.get("*", 0.0)), default=None)
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+class CompressionMiddleware:
+    """Compress complete JSON/text bodies in the negotiated encoding.
+
+    Streamed responses (profile downloads) and responses that already carry a
+    Content-Encoding pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        encoding = None
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"accept-encoding":
+                    encoding = negotiate_encoding(value.decode("latin-1"))
+                    break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (
+                not message.get("more_body", False)
+                and "content-encoding" not in headers
+                and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+            ):
+                headers.add_vary_header("Accept-Encoding")
+                if len(body) < COMPRESSION_MIN_BYTES:
+                    compression_stats["skipped_small"] += 1
+                else:
+                    compressed = compress_body(body, encoding)
+                    compression_stats["compressed"] += 1
+                    compression_stats["bytes_in"] += len(body)
+                    compression_stats["bytes_out"] += len(compressed)
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(compressed))
+                    message = {**message, "body": compressed}
+            await send(start_message)
+            start_message = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+# Added before the profiling middleware (when that is enabled) so it runs inside
+# it: that one re-streams every body in chunks, which this middleware leaves alone
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Admin configuration (admin endpoints are disabled unless a token is set)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Profiling configuration
+# Requests carrying "X-Profile: <PROFILE_TOKEN>" are always profiled, and
+# PROFILE_SAMPLE_RATE (0.0 - 1.0) randomly profiles a share of all requests.
+# With neither set the profiling middleware is not installed at all: as an
+# http middleware it would re-stream every response for nothing
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+
+# cProfile hooks the whole thread, so only one request is profiled at a time
+profile_lock = asyncio.Lock()
+
+# Memory diagnostics: TRACEMALLOC_FRAMES > 0 traces allocations from startup
+# with that many frames per traceback (tracing can also be switched on and
+# off through the admin API; it slows allocation-heavy code noticeably)
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "0"))
+if TRACEMALLOC_FRAMES > 0:
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+
+# Previous snapshot, so each /admin/memory?compare=true shows growth since the last call
+last_memory_snapshot = None
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject admin requests that do not carry the configured admin token"""
+    if not ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin access denied")
+
+def should_profile_request(request: Request) -> bool:
+    """Decide whether a request should be profiled"""
+    profile_header = request.headers.get("x-profile")
+    if PROFILE_TOKEN and profile_header and secrets.compare_digest(profile_header, PROFILE_TOKEN):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+def save_profile(profiler: cProfile.Profile, request: Request, duration_ms: int) -> str:
+    """Write a profile as a pstats file and prune the oldest ones"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path_slug = re.sub(r'[^A-Za-z0-9]+', '_', request.url.path).strip('_') or "root"
+    name = f"{int(time.time() * 1000)}-{request.method.lower()}-{path_slug[:80]}-{duration_ms}ms.pstats"
+    profiler.dump_stats(os.path.join(PROFILE_DIR, name))
+    
+    profiles = sorted(f for f in os.listdir(PROFILE_DIR) if f.endswith('.pstats'))
+    for old_name in profiles[:max(0, len(profiles) - PROFILE_MAX_FILES)]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, old_name))
+        except OSError:
+            pass
+    
+    return name
+
+async def profile_requests(request: Request, call_next):
+    """Profile opted-in or sampled requests and store the result under PROFILE_DIR"""
+    if profile_lock.locked() or not should_profile_request(request):
+        return await call_next(request)
+    
+    async with profile_lock:
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.disable()
+        duration_ms = int((time.perf_counter() - start) * 1000)
+        
+        try:
+            response.headers["X-Profile-Id"] = save_profile(profiler, request, duration_ms)
+        except OSError:
+            pass  # Never fail a request because its profile could not be stored
+        
+        return response
+
+if PROFILE_TOKEN or PROFILE_SAMPLE_RATE > 0:
+    app.middleware("http")(profile_requests)
+
+# Result cache shared by all worker processes (SQLite in WAL mode); set
+# RESULT_CACHE_PATH to an empty string to disable it
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "tweet_cache.sqlite3")
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "86400"))
+RESULT_CACHE_NEGATIVE_TTL = int(os.getenv("RESULT_CACHE_NEGATIVE_TTL", "60"))
+
+class SQLiteStore:
+    """Base for small SQLite-backed stores shared across worker processes.
+    
+    Every thread gets its own connection; calls block, so async code goes
+    through asyncio.to_thread. Subclasses create their tables in SCHEMA
+    (one or more statements).
+    """
+    
+    SCHEMA = ""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.local()
+    
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self.local.conn = conn
+        return conn
+
+class ResultCache(SQLiteStore):
+    """Scrape results keyed by tweet ID. Cache errors are treated as misses."""
+    
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS tweets ("
+        "tweet_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+    )
+    
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, tweet_id: str) -> Optional[TweetData]:
+        try:
+            row = self.connection().execute(
+                "SELECT data FROM tweets WHERE tweet_id = ? AND expires_at > ?", (tweet_id, time.time())
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+        
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return TweetData.model_validate_json(row[0])
+    
+    def put(self, tweet_data: TweetData):
+        ttl = RESULT_CACHE_TTL if tweet_data.exists else RESULT_CACHE_NEGATIVE_TTL
+        now = time.time()
+        try:
+            conn = self.connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO tweets (tweet_id, data, expires_at) VALUES (?, ?, ?)",
+                (tweet_data.tweetId, tweet_data.model_dump_json(), now + ttl)
+            )
+            # Occasionally drop expired rows so the file does not grow forever
+            if random.random() < 0.01:
+                conn.execute("DELETE FROM tweets WHERE expires_at <= ?", (now,))
+        except sqlite3.Error:
+            pass
+    
+    async def get_async(self, tweet_id: str) -> Optional[TweetData]:
+        return await asyncio.to_thread(self.get, tweet_id)
+    
+    async def put_async(self, tweet_data: TweetData):
+        await asyncio.to_thread(self.put, tweet_data)
+    
+    def stats(self) -> dict:
+        return {"enabled": True, "path": self.path, "hits": self.hits, "misses": self.misses}
+
+result_cache = ResultCache(RESULT_CACHE_PATH) if RESULT_CACHE_PATH else None
+
+# Tweet ID -> author username learned from successful extractions, kept
+# without expiry so repeat lookups go straight to the canonical status URL
+AUTHOR_INDEX_PATH = os.getenv("AUTHOR_INDEX_PATH", RESULT_CACHE_PATH)
+USERNAME_PATTERN = re.compile(r'^[A-Za-z0-9_]{1,15}$')
+
+class AuthorIndex(SQLiteStore):
+    """Persistent tweet ID -> author username map. Errors are treated as unknown authors."""
+    
+    SCHEMA = "CREATE TABLE IF NOT EXISTS tweet_authors (tweet_id TEXT PRIMARY KEY, username TEXT NOT NULL)"
+    
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.hits = 0
+        self.learned = 0
+    
+    def get(self, tweet_id: str) -> Optional[str]:
+        try:
+            row = self.connection().execute(
+                "SELECT username FROM tweet_authors WHERE tweet_id = ?", (tweet_id,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        self.hits += 1
+        return row[0]
+    
+    def put(self, tweet_id: str, username: str):
+        if username == "unknown" or not USERNAME_PATTERN.match(username):
+            return
+        try:
+            self.connection().execute(
+                "INSERT OR REPLACE INTO tweet_authors (tweet_id, username) VALUES (?, ?)", (tweet_id, username)
+            )
+            self.learned += 1
+        except sqlite3.Error:
+            pass
+    
+    async def get_async(self, tweet_id: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, tweet_id)
+    
+    async def put_async(self, tweet_id: str, username: str):
+        await asyncio.to_thread(self.put, tweet_id, username)
+    
+    def stats(self) -> dict:
+        return {"enabled": True, "path": self.path, "hits": self.hits, "learned": self.learned}
+
+author_index = AuthorIndex(AUTHOR_INDEX_PATH) if AUTHOR_INDEX_PATH else None
+
+# Content hash -> tweet behind each commitment handed out by commitment=true,
+# kept without expiry so the text behind an attested hash stays retrievable
+COMMITMENT_STORE_PATH = os.getenv("COMMITMENT_STORE_PATH", RESULT_CACHE_PATH)
+
+class CommitmentStore(SQLiteStore):
+    """Persistent keccak256 commitment -> author, text and hash preimage. Errors are treated as unknown hashes."""
+    
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS tweet_commitments ("
+        "content_hash TEXT PRIMARY KEY, tweet_id TEXT NOT NULL, author TEXT NOT NULL, "
+        "text TEXT NOT NULL, preimage TEXT NOT NULL)"
+    )
+    
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.hits = 0
+        self.stored = 0
+    
+    def get(self, content_hash: str) -> Optional[dict]:
+        try:
+            row = self.connection().execute(
+                "SELECT tweet_id, author, text, preimage FROM tweet_commitments WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        self.hits += 1
+        tweet_id, author, text, preimage = row
+        return {"contentHash": content_hash, "tweetId": tweet_id, "authorUsername": author, "tweetText": text, "preimage": preimage}
+    
+    def put(self, content_hash: str, tweet_data: TweetData, preimage: str):
+        try:
+            self.connection().execute(
+                "INSERT OR REPLACE INTO tweet_commitments (content_hash, tweet_id, author, text, preimage) VALUES (?, ?, ?, ?, ?)",
+                (content_hash, tweet_data.tweetId, tweet_data.authorUsername, tweet_data.tweetText, preimage)
+            )
+            self.stored += 1
+        except sqlite3.Error:
+            pass
+    
+    async def get_async(self, content_hash: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.get, content_hash)
+    
+    async def put_async(self, content_hash: str, tweet_data: TweetData, preimage: str):
+        await asyncio.to_thread(self.put, content_hash, tweet_data, preimage)
+    
+    def stats(self) -> dict:
+        return {"enabled": True, "path": self.path, "hits": self.hits, "stored": self.stored}
+
+commitment_store = CommitmentStore(COMMITMENT_STORE_PATH) if COMMITMENT_STORE_PATH else None
+
+# Optional archive of raw upstream 200 responses for offline re-extraction
+# (reextract.py). Bodies are zlib-compressed and stored once per SHA-256;
+# each fetch records which URL served which body. Empty disables it.
+RAW_ARCHIVE_PATH = os.getenv("RAW_ARCHIVE_PATH", "")
+RAW_ARCHIVE_LEVEL = int(os.getenv("RAW_ARCHIVE_LEVEL", "6"))
+
+class RawArchive(SQLiteStore):
+    """Content-addressed store of upstream response bodies. Errors are ignored."""
+    
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS raw_bodies ("
+        "digest TEXT PRIMARY KEY, size INTEGER NOT NULL, body BLOB NOT NULL);"
+        "CREATE TABLE IF NOT EXISTS raw_fetches ("
+        "id INTEGER PRIMARY KEY, tweet_id TEXT NOT NULL, url TEXT NOT NULL, content_type TEXT NOT NULL, "
+        "digest TEXT NOT NULL, fetched_at REAL NOT NULL, UNIQUE (url, digest));"
+        "CREATE INDEX IF NOT EXISTS raw_fetches_tweet ON raw_fetches (tweet_id);"
+    )
+    
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.stored = 0
+        self.deduplicated = 0
+    
+    def put(self, tweet_id: str, url: str, content_type: str, body: bytes):
+        digest = hashlib.sha256(body).hexdigest()
+        try:
+            conn = self.connection()
+            known = conn.execute("SELECT 1 FROM raw_bodies WHERE digest = ?", (digest,)).fetchone()
+            if known:
+                self.deduplicated += 1
+            else:
+                conn.execute(
+                    "INSERT OR IGNORE INTO raw_bodies (digest, size, body) VALUES (?, ?, ?)",
+                    (digest, len(body), zlib.compress(body, RAW_ARCHIVE_LEVEL))
+                )
+                self.stored += 1
+            conn.execute(
+                "INSERT OR IGNORE INTO raw_fetches (tweet_id, url, content_type, digest, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (tweet_id, url, content_type, digest, time.time())
+            )
+        except sqlite3.Error:
+            pass
+    
+    async def put_async(self, tweet_id: str, url: str, content_type: str, body: bytes):
+        await asyncio.to_thread(self.put, tweet_id, url, content_type, body)
+    
+    def fetches(self, tweet_ids=None) -> list:
+        """(tweet_id, url, content_type, digest) of archived fetches, oldest first"""
+        query = "SELECT tweet_id, url, content_type, digest FROM raw_fetches"
+        params = ()
+        if tweet_ids:
+            query += f" WHERE tweet_id IN ({','.join('?' * len(tweet_ids))})"
+            params = tuple(tweet_ids)
+        return self.connection().execute(query + " ORDER BY id", params).fetchall()
+    
+    def body(self, digest: str) -> Optional[bytes]:
+        row = self.connection().execute("SELECT body FROM raw_bodies WHERE digest = ?", (digest,)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+    
+    def stats(self) -> dict:
+        return {"enabled": True, "path": self.path, "stored": self.stored, "deduplicated": self.deduplicated}
+
+raw_archive = RawArchive(RAW_ARCHIVE_PATH) if RAW_ARCHIVE_PATH else None
+
+# Cluster mode: with CLUSTER_NODES set (comma separated base URLs of every
+# instance, including this one as CLUSTER_SELF_URL), each instance owns a
+# consistent-hash slice of the tweet ID space and forwards other tweets to
+# their owner, so each tweet is scraped and cached on one node only
+CLUSTER_NODES = [node.strip().rstrip("/") for node in os.getenv("CLUSTER_NODES", "").split(",") if node.strip()]
+CLUSTER_SELF_URL = os.getenv("CLUSTER_SELF_URL", "").rstrip("/")
+CLUSTER_VNODES = int(os.getenv("CLUSTER_VNODES", "160"))
+CLUSTER_FORWARD_TIMEOUT = float(os.getenv("CLUSTER_FORWARD_TIMEOUT", "120"))
+CLUSTER_FORWARDED_HEADER = "X-Cluster-Forwarded"
+# Shared by all nodes and sent with forwarded requests; only requests carrying
+# it keep the priority lane the forwarding node resolved (unset: never trusted)
+CLUSTER_SECRET = os.getenv("CLUSTER_SECRET", "")
+CLUSTER_SECRET_HEADER = "X-Cluster-Secret"
+
+class HashRing:
+    """Consistent-hash ring mapping keys to nodes through virtual node points"""
+    
+    def __init__(self, nodes: list, vnodes: int):
+        self.nodes = list(nodes)
+        self.points = sorted(
+            (self.hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes)
+        )
+        self.hashes = [point for point, _ in self.points]
+    
+    @staticmethod
+    def hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+    
+    def owner(self, key: str) -> str:
+        index = bisect.bisect(self.hashes, self.hash(key)) % len(self.points)
+        return self.points[index][1]
+
+if CLUSTER_NODES and CLUSTER_SELF_URL not in CLUSTER_NODES:
+    raise RuntimeError("CLUSTER_SELF_URL must be one of CLUSTER_NODES")
+
+cluster_ring = HashRing(CLUSTER_NODES, CLUSTER_VNODES) if len(CLUSTER_NODES) > 1 else None
+
+def from_cluster_peer(x_cluster_secret: Optional[str]) -> bool:
+    """Whether a request was forwarded by another node of this cluster"""
+    return bool(
+        cluster_ring is not None and CLUSTER_SECRET and x_cluster_secret
+        and secrets.compare_digest(x_cluster_secret, CLUSTER_SECRET)
+    )
+cluster_stats = {"forwarded": 0, "forward_failures": 0, "forward_rejected": 0, "received_forwarded": 0}
+
+# Pooled keep-alive client for node-to-node forwarding (created on first use)
+cluster_client: Optional[httpx.AsyncClient] = None
+
+def get_cluster_client() -> httpx.AsyncClient:
+    global cluster_client
+    if cluster_client is None:
+        cluster_client = httpx.AsyncClient(
+            timeout=CLUSTER_FORWARD_TIMEOUT,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+        )
+    return cluster_client
+
+async def forward_to_owner(owner: str, tweet_id: str, lane: str, username: Optional[str] = None) -> Optional[TweetData]:
+    """Ask the owning node for a tweet; None if it could not answer"""
+    try:
+        response = await get_cluster_client().get(
+            f"{owner}/api/v1/tweets/{tweet_id}",
+            params={"username": username} if username else None,
+            headers={
+                CLUSTER_FORWARDED_HEADER: CLUSTER_SELF_URL,
+                CLUSTER_SECRET_HEADER: CLUSTER_SECRET,
+                REQUEST_CLASS_HEADER: lane
+            }
+        )
+        if response.status_code == 200:
+            cluster_stats["forwarded"] += 1
+            return TweetData.model_validate(response.json())
+        if response.status_code == 503:
+            # Owner is shedding load; pass that on instead of scraping here
+            cluster_stats["forward_rejected"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server busy, retry later",
+                headers={"Retry-After": response.headers.get("Retry-After", "5")}
+            )
+    except (httpx.HTTPError, ValueError):
+        pass
+    cluster_stats["forward_failures"] += 1
+    return None
+
+@app.on_event("shutdown")
+async def close_cluster_client():
+    if cluster_client is not None:
+        await cluster_client.aclose()
+
+# Admission control: at most ADMISSION_MAX_ACTIVE scrapes run at once per
+# worker, up to ADMISSION_MAX_QUEUE more per priority lane wait for a slot, and
+# anything beyond that (or waiting longer than ADMISSION_QUEUE_TIMEOUT) gets a
+# fast 503 with Retry-After instead of piling up. ADMISSION_MAX_ACTIVE=0
+# disables the limit.
+ADMISSION_MAX_ACTIVE = int(os.getenv("ADMISSION_MAX_ACTIVE", "32"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "30"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+
+# Priority lanes, highest first. A free slot always goes to a queued FDC
+# attestation fetch first; interactive and batch share the rest by weight, and
+# batch may never hold more than PRIORITY_BATCH_MAX_SHARE of the slots, so
+# bulk jobs cannot occupy the capacity FDC verifiers need inside a round.
+PRIORITY_LANES = ("fdc", "interactive", "batch")
+PRIORITY_WEIGHTS = {"interactive": 3, "batch": 1}
+PRIORITY_WEIGHTS.update(
+    (lane.strip(), int(weight)) for lane, weight in
+    (item.split("=") for item in os.getenv("PRIORITY_WEIGHTS", "").split(",") if item.strip())
+)
+PRIORITY_BATCH_MAX_SHARE = float(os.getenv("PRIORITY_BATCH_MAX_SHARE", "0.5"))
+
+def parse_lane_map(value: str) -> dict:
+    """Parse "name=lane,name=lane" into a dict, ignoring unknown lanes"""
+    pairs = (item.rsplit("=", 1) for item in value.split(",") if "=" in item)
+    return {name.strip(): lane.strip() for name, lane in pairs if lane.strip() in PRIORITY_LANES}
+
+# Lane for each API key ("X-API-Key" header) and default lane for each route prefix
+PRIORITY_API_KEYS = parse_lane_map(os.getenv("PRIORITY_API_KEYS", ""))
+PRIORITY_ROUTE_LANES = parse_lane_map(os.getenv(
+    "PRIORITY_ROUTE_LANES", "/api/v1/verify-tweet=fdc,/api/v1/tweets/=interactive"
+))
+PRIORITY_DEFAULT_LANE = "interactive"
+REQUEST_CLASS_HEADER = "X-Request-Class"
+
+def request_lane(
+    request: Request,
+    x_api_key: Optional[str] = Header(None),
+    x_request_class: Optional[str] = Header(None),
+    x_cluster_secret: Optional[str] = Header(None)
+) -> str:
+    """Priority lane for a request: by API key, else by route, optionally lowered by header.
+    
+    X-Request-Class can only move a request to a lower lane than its route
+    gives it (bulk jobs tagging themselves "batch"); only API keys promote.
+    Requests forwarded by a cluster peer (proven by CLUSTER_SECRET) keep the
+    lane the receiving node already resolved.
+    """
+    if x_request_class in PRIORITY_LANES and from_cluster_peer(x_cluster_secret):
+        return x_request_class
+    if x_api_key and x_api_key in PRIORITY_API_KEYS:
+        return PRIORITY_API_KEYS[x_api_key]
+    
+    lane = PRIORITY_DEFAULT_LANE
+    for prefix, route_lane in PRIORITY_ROUTE_LANES.items():
+        if request.url.path.startswith(prefix):
+            lane = route_lane
+            break
+    if x_request_class in PRIORITY_LANES and PRIORITY_LANES.index(x_request_class) > PRIORITY_LANES.index(lane):
+        lane = x_request_class
+    return lane
+
+class AdmissionTicket:
+    """One scrape's place in admission control; its lane can be raised while it waits"""
+    
+    def __init__(self, lane: str):
+        self.lane = lane
+        self.running_lane = None
+        self.waiter: Optional[asyncio.Future] = None
+
+class AdmissionController:
+    """Concurrency limit with bounded per-lane FIFO wait queues in front of the scraper"""
+    
+    def __init__(self, max_active: int, max_queue: int, queue_timeout: float, retry_after: int,
+                 weights: dict, batch_max_share: float):
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.weights = weights
+        self.batch_max_active = max(1, int(max_active * batch_max_share))
+        self.active = 0
+        self.active_by_lane = {lane: 0 for lane in PRIORITY_LANES}
+        self.queues = {lane: collections.deque() for lane in PRIORITY_LANES}
+        self.credits = {lane: 0 for lane in PRIORITY_LANES}
+        self.counters = {
+            lane: {"admitted": 0, "queued": 0, "rejected": 0, "timed_out": 0} for lane in PRIORITY_LANES
+        }
+    
+    def reject(self, lane: str, reason: str):
+        self.counters[lane][reason] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, retry later",
+            headers={"Retry-After": str(self.retry_after)}
+        )
+    
+    def can_start(self, lane: str) -> bool:
+        if self.active >= self.max_active:
+            return False
+        return lane != "batch" or self.active_by_lane["batch"] < self.batch_max_active
+    
+    def start(self, ticket: AdmissionTicket):
+        ticket.running_lane = ticket.lane
+        self.active += 1
+        self.active_by_lane[ticket.lane] += 1
+        self.counters[ticket.lane]["admitted"] += 1
+    
+    def next_lane(self) -> Optional[str]:
+        """FDC strictly first, then smooth weighted round robin over the other lanes"""
+        if self.queues["fdc"]:
+            return "fdc"
+        eligible = [lane for lane in PRIORITY_LANES[1:] if self.queues[lane] and self.can_start(lane)]
+        if not eligible:
+            return None
+        for lane in eligible:
+            self.credits[lane] += self.weights.get(lane, 1)
+        lane = max(eligible, key=lambda name: self.credits[name])
+        self.credits[lane] -= sum(self.weights.get(name, 1) for name in eligible)
+        return lane
+    
+    def dispatch(self):
+        """Hand free slots to queued tickets"""
+        while self.active < self.max_active:
+            lane = self.next_lane()
+            if lane is None:
+                return
+            ticket = self.queues[lane].popleft()
+            self.start(ticket)
+            ticket.waiter.set_result(None)
+    
+    def dequeue(self, ticket: AdmissionTicket):
+        ticket.waiter.cancel()
+        self.queues[ticket.lane].remove(ticket)
+    
+    async def acquire(self, ticket: AdmissionTicket):
+        lane = ticket.lane
+        if self.can_start(lane) and not self.queues[lane]:
+            self.start(ticket)
+            return
+        if len(self.queues[lane]) >= self.max_queue:
+            self.reject(lane, "rejected")
+        
+        ticket.waiter = asyncio.get_running_loop().create_future()
+        self.queues[lane].append(ticket)
+        self.counters[lane]["queued"] += 1
+        try:
+            await asyncio.wait({ticket.waiter}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            if ticket.waiter.done():
+                self.release(ticket)
+            else:
+                self.dequeue(ticket)
+            raise
+        if not ticket.waiter.done():
+            self.dequeue(ticket)
+            self.reject(ticket.lane, "timed_out")
+    
+    def release(self, ticket: AdmissionTicket):
+        self.active -= 1
+        self.active_by_lane[ticket.running_lane] -= 1
+        self.dispatch()
+    
+    def promote(self, ticket: AdmissionTicket, lane: str):
+        """Move a waiting ticket up to a higher lane (a higher-priority caller joined its fetch)"""
+        if PRIORITY_LANES.index(lane) >= PRIORITY_LANES.index(ticket.lane):
+            return
+        if ticket.waiter is not None and not ticket.waiter.done():
+            self.queues[ticket.lane].remove(ticket)
+            self.queues[lane].append(ticket)
+            ticket.lane = lane
+            self.dispatch()
+        elif ticket.running_lane is None:
+            ticket.lane = lane
+    
+    @contextlib.asynccontextmanager
+    async def slot(self, ticket: AdmissionTicket):
+        await self.acquire(ticket)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+    
+    def stats(self) -> dict:
+        return {
+            "enabled": True,
+            "active": self.active,
+            "queue_depth": sum(len(queue) for queue in self.queues.values()),
+            "max_active": self.max_active,
+            "max_queue": self.max_queue,
+            "batch_max_active": self.batch_max_active,
+            "lanes": {
+                lane: {
+                    "active": self.active_by_lane[lane],
+                    "queue_depth": len(self.queues[lane]),
+                    "weight": "strict" if lane == "fdc" else self.weights.get(lane, 1),
+                    **self.counters[lane]
+                }
+                for lane in PRIORITY_LANES
+            }
+        }
+
+admission = AdmissionController(
+    ADMISSION_MAX_ACTIVE, ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT, ADMISSION_RETRY_AFTER,
+    PRIORITY_WEIGHTS, PRIORITY_BATCH_MAX_SHARE
+) if ADMISSION_MAX_ACTIVE > 0 else None
+
 # Twitter/X scraping configuration
 TWITTER_BASE_URL = "https://x.com"
 
+# Per-request upstream timeout and the random delay before each attempt
+SCRAPE_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "30"))
+SCRAPE_DELAY_MIN = float(os.getenv("SCRAPE_DELAY_MIN", "0.5"))
+SCRAPE_DELAY_MAX = float(os.getenv("SCRAPE_DELAY_MAX", "2.0"))
+
+# Send every upstream request to "<UPSTREAM_OVERRIDE_URL>/<host>/<path>" instead
+# of the real host (used by the offline benchmarks in bench/)
+UPSTREAM_OVERRIDE_URL = os.getenv("UPSTREAM_OVERRIDE_URL", "").rstrip("/")
+
+# Bound the work a single hostile or broken upstream page can cause: markup
+# past either limit is dropped before parsing (the tweet sits near the top)
+MAX_PAGE_BYTES = int(os.getenv("MAX_PAGE_BYTES", str(5 * 1024 * 1024)))
+MAX_PAGE_TAGS = int(os.getenv("MAX_PAGE_TAGS", "10000"))
+
 # User agents to rotate (to avoid detection)
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -63,103 +887,784 @@ def get_scraping_headers():
         "Cache-Control": "max-age=0"
     }
 
-def extract_tweet_id(tweet_input: str) -> str:
-    """Extract tweet ID from URL or return as-is if already an ID"""
-    # Handle Twitter/X URL formats
-    url_patterns = [
-        r'https?://(?:www\.)?twitter\.com/[^/]+/status/(\d+)',
-        r'https?://(?:www\.)?x\.com/[^/]+/status/(\d+)',
-    ]
+def upstream_url(url: str) -> str:
+    """Rewrite an upstream URL to UPSTREAM_OVERRIDE_URL when one is configured"""
+    if not UPSTREAM_OVERRIDE_URL:
+        return url
+    return UPSTREAM_OVERRIDE_URL + "/" + url.split("://", 1)[-1]
+
+def limit_page_size(html_content: str) -> str:
+    """Cut a page after MAX_PAGE_BYTES characters or MAX_PAGE_TAGS tags before parsing"""
+    html_content = html_content[:MAX_PAGE_BYTES]
+    if html_content.count('<') <= MAX_PAGE_TAGS:
+        return html_content
+    
+    position = -1
+    for _ in range(MAX_PAGE_TAGS):
+        position = html_content.find('<', position + 1)
+    return html_content[:position]
+
+def parse_json_body(body: str):
+    """Decode an upstream JSON body, or return None if it is oversized or malformed"""
+    if len(body) > MAX_PAGE_BYTES:
+        return None
+    try:
+        return json.loads(body)
+    except (ValueError, RecursionError):
+        return None
+
+# Adaptive per-source timeouts: each upstream host gets SOURCE_TIMEOUT_MULTIPLIER
+# times a high percentile of its recent response times, clamped to
+# [SOURCE_TIMEOUT_FLOOR, SOURCE_TIMEOUT_CEILING]. Hosts that keep timing out or
+# refusing connections drop to the floor until they answer again; every
+# SOURCE_TIMEOUT_DEAD_RETRY seconds one request to such a host gets its learned
+# timeout again, so a host that is merely slower than the floor can come back.
+# Waiting for a free pooled connection is not the host's fault and not counted.
+# The windows are saved to SOURCE_TIMEOUTS_PATH so a restart does not relearn them.
+SOURCE_TIMEOUTS_PATH = os.getenv("SOURCE_TIMEOUTS_PATH", RESULT_CACHE_PATH)
+SOURCE_TIMEOUT_PERCENTILE = float(os.getenv("SOURCE_TIMEOUT_PERCENTILE", "95"))
+SOURCE_TIMEOUT_MULTIPLIER = float(os.getenv("SOURCE_TIMEOUT_MULTIPLIER", "3"))
+SOURCE_TIMEOUT_FLOOR = float(os.getenv("SOURCE_TIMEOUT_FLOOR", "1.0"))
+SOURCE_TIMEOUT_CEILING = float(os.getenv("SOURCE_TIMEOUT_CEILING", str(SCRAPE_TIMEOUT)))
+SOURCE_TIMEOUT_WINDOW = int(os.getenv("SOURCE_TIMEOUT_WINDOW", "200"))
+SOURCE_TIMEOUT_MIN_SAMPLES = int(os.getenv("SOURCE_TIMEOUT_MIN_SAMPLES", "20"))
+SOURCE_TIMEOUT_DEAD_AFTER = int(os.getenv("SOURCE_TIMEOUT_DEAD_AFTER", "3"))
+SOURCE_TIMEOUT_DEAD_RETRY = float(os.getenv("SOURCE_TIMEOUT_DEAD_RETRY", "30"))
+SOURCE_TIMEOUT_SAVE_EVERY = 50
+
+class SourceTimeouts(SQLiteStore):
+    """Rolling response-time window per upstream host and the timeout derived from it.
+    
+    Lives in memory; the windows are written back every SOURCE_TIMEOUT_SAVE_EVERY
+    observations of a host, from a thread, and on shutdown (when a path is set).
+    """
+    
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS source_latency ("
+        "host TEXT PRIMARY KEY, samples TEXT NOT NULL, consecutive_failures INTEGER NOT NULL)"
+    )
+    
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.samples = {}
+        self.failures = {}
+        self.unsaved = {}
+        self.retried = {}
+        self.saving = set()
+        if path:
+            self.load()
+    
+    def load(self):
+        try:
+            rows = self.connection().execute(
+                "SELECT host, samples, consecutive_failures FROM source_latency"
+            ).fetchall()
+        except sqlite3.Error:
+            return
+        for host, samples, failures in rows:
+            self.samples[host] = collections.deque(json.loads(samples), maxlen=SOURCE_TIMEOUT_WINDOW)
+            self.failures[host] = failures
+    
+    def snapshot(self, host: str) -> tuple:
+        """The row of a host, taken on the event loop so a writer thread never reads a live window"""
+        self.unsaved[host] = 0
+        samples = json.dumps([round(sample, 4) for sample in self.samples.get(host, ())])
+        return host, samples, self.failures.get(host, 0)
+    
+    def write(self, host: str, samples: str, failures: int):
+        if not self.path:
+            return
+        try:
+            self.connection().execute(
+                "INSERT OR REPLACE INTO source_latency (host, samples, consecutive_failures) VALUES (?, ?, ?)",
+                (host, samples, failures)
+            )
+        except sqlite3.Error:
+            pass
+    
+    def save(self, host: str):
+        self.write(*self.snapshot(host))
+    
+    def save_all(self):
+        for host, unsaved in list(self.unsaved.items()):
+            if unsaved:
+                self.save(host)
+    
+    def percentile(self, host: str) -> Optional[float]:
+        samples = self.samples.get(host)
+        if not samples or len(samples) < SOURCE_TIMEOUT_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * SOURCE_TIMEOUT_PERCENTILE / 100))]
+    
+    def host_timeout(self, host: str, retry: bool = False) -> float:
+        if self.failures.get(host, 0) >= SOURCE_TIMEOUT_DEAD_AFTER:
+            # Dead host: the floor, except for one retry per SOURCE_TIMEOUT_DEAD_RETRY
+            # (the first request after a restart is one) with the learned timeout
+            now = time.monotonic()
+            if not retry or now - self.retried.get(host, -SOURCE_TIMEOUT_DEAD_RETRY) < SOURCE_TIMEOUT_DEAD_RETRY:
+                return SOURCE_TIMEOUT_FLOOR
+            self.retried[host] = now
+        latency = self.percentile(host)
+        if latency is None:
+            return SOURCE_TIMEOUT_CEILING
+        return min(SOURCE_TIMEOUT_CEILING, max(SOURCE_TIMEOUT_FLOOR, latency * SOURCE_TIMEOUT_MULTIPLIER))
+    
+    def timeout_for(self, url: str) -> float:
+        return self.host_timeout(urlparse(url).hostname, retry=True)
+    
+    def record(self, url: str, seconds: Optional[float]):
+        """Record a response time, or a timeout / refused connection when seconds is None"""
+        host = urlparse(url).hostname
+        if seconds is None:
+            self.failures[host] = self.failures.get(host, 0) + 1
+        else:
+            self.failures[host] = 0
+            self.samples.setdefault(host, collections.deque(maxlen=SOURCE_TIMEOUT_WINDOW)).append(seconds)
+        self.unsaved[host] = self.unsaved.get(host, 0) + 1
+        if self.path and (self.unsaved[host] >= SOURCE_TIMEOUT_SAVE_EVERY or self.failures[host] == SOURCE_TIMEOUT_DEAD_AFTER):
+            task = asyncio.ensure_future(asyncio.to_thread(self.write, *self.snapshot(host)))
+            self.saving.add(task)
+            task.add_done_callback(self.saving.discard)
+    
+    def stats(self) -> dict:
+        hosts = {}
+        for host in sorted(set(self.samples) | set(self.failures)):
+            latency = self.percentile(host)
+            hosts[host] = {
+                "timeout_s": round(self.host_timeout(host), 3),
+                "latency_percentile_ms": round(latency * 1000, 1) if latency is not None else None,
+                "samples": len(self.samples.get(host, ())),
+                "consecutive_failures": self.failures.get(host, 0),
+            }
+        return {"percentile": SOURCE_TIMEOUT_PERCENTILE, "hosts": hosts}
+
+source_timeouts = SourceTimeouts(SOURCE_TIMEOUTS_PATH)
+
+@app.on_event("shutdown")
+def save_source_timeouts():
+    source_timeouts.save_all()
+
+async def timed_upstream_get(client: httpx.AsyncClient, url: str, headers: Optional[dict] = None) -> httpx.Response:
+    """GET an upstream URL with its adaptive timeout, recording how long it took"""
+    start = time.perf_counter()
+    try:
+        response = await client.get(upstream_url(url), headers=headers, timeout=source_timeouts.timeout_for(url))
+    except httpx.PoolTimeout:
+        raise
+    except (httpx.TimeoutException, httpx.ConnectError):
+        source_timeouts.record(url, None)
+        raise
+    source_timeouts.record(url, time.perf_counter() - start)
+    return response
+
+@contextlib.asynccontextmanager
+async def timed_upstream_stream(client: httpx.AsyncClient, url: str, headers: Optional[dict] = None, method: str = "GET"):
+    """Like timed_upstream_get, but yields the response before its body is read.
+    Only opening the response (up to its headers) is timed and recorded, once."""
+    request = client.build_request(
+        method, upstream_url(url), headers=headers or get_scraping_headers(), timeout=source_timeouts.timeout_for(url)
+    )
+    start = time.perf_counter()
+    try:
+        response = await client.send(request, stream=True)
+    except httpx.PoolTimeout:
+        raise
+    except (httpx.TimeoutException, httpx.ConnectError):
+        source_timeouts.record(url, None)
+        raise
+    source_timeouts.record(url, time.perf_counter() - start)
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+# Upstream bodies are read in chunks and cut after MAX_PAGE_BYTES, and every
+# body being read or extracted counts against a per-worker budget of
+# INFLIGHT_BYTES_LIMIT bytes; scrapes that do not fit wait until others release
+# theirs. A body reserves its Content-Length when it is sent as is, else
+# PAGE_RESERVATION_STEP (a compressed body's length says nothing about the
+# decoded one), and the reservation doubles as decoded bytes arrive, up to
+# MAX_PAGE_BYTES + 1.
+INFLIGHT_BYTES_LIMIT = int(os.getenv("INFLIGHT_BYTES_LIMIT", str(64 * 1024 * 1024)))
+PAGE_RESERVATION_STEP = 64 * 1024
+
+class ByteBudget:
+    """Bytes of upstream bodies held at once by one worker"""
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.peak = 0
+        self.waits = 0
+        self.waiters = collections.deque()
+        self.holders = 0
+        self.growing = 0
+    
+    async def take(self, size: int, growing: bool = False):
+        if self.used + size > self.limit:
+            self.waits += 1
+        # A holder growing its reservation goes ahead anyway once every holder is
+        # waiting to grow: none of them would ever release anything
+        self.growing += growing
+        try:
+            while self.used + size > self.limit and not (growing and self.growing >= self.holders):
+                waiter = asyncio.get_running_loop().create_future()
+                self.waiters.append(waiter)
+                try:
+                    await waiter
+                finally:
+                    if waiter in self.waiters:
+                        self.waiters.remove(waiter)
+        finally:
+            self.growing -= growing
+        self.used += size
+        self.peak = max(self.peak, self.used)
+    
+    @contextlib.asynccontextmanager
+    async def reserve(self, size: int):
+        """Hold size bytes; the yielded ByteReservation can grow while a body is read"""
+        # A single body larger than the budget still gets the whole budget
+        reservation = ByteReservation(self, min(size, self.limit))
+        await self.take(reservation.size)
+        self.holders += 1
+        try:
+            yield reservation
+        finally:
+            self.holders -= 1
+            self.used -= reservation.size
+            while self.waiters:
+                waiter = self.waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+    
+    def stats(self) -> dict:
+        return {"limit": self.limit, "used": self.used, "peak": self.peak, "waits": self.waits, "waiting": len(self.waiters)}
+
+class ByteReservation:
+    __slots__ = ("budget", "size")
+    
+    def __init__(self, budget: ByteBudget, size: int):
+        self.budget = budget
+        self.size = size
+    
+    async def grow_to(self, size: int):
+        size = min(size, self.budget.limit)
+        if size > self.size:
+            await self.budget.take(size - self.size, growing=True)
+            self.size = size
+
+inflight_bytes = ByteBudget(INFLIGHT_BYTES_LIMIT)
+
+@contextlib.asynccontextmanager
+async def upstream_page(client: httpx.AsyncClient, url: str, headers: dict, method: str = "GET"):
+    """Yield (response, body) of an upstream request. A 200 body is at most MAX_PAGE_BYTES + 1
+    bytes (one more marks it as cut) and is held within inflight_bytes until the block exits."""
+    async with timed_upstream_stream(client, url, headers, method) as response:
+        if response.status_code != 200:
+            yield response, b""
+            return
+        expected = PAGE_RESERVATION_STEP
+        if response.headers.get("content-encoding", "identity").strip().lower() == "identity":
+            try:
+                expected = int(response.headers.get("content-length", ""))
+            except ValueError:
+                pass
+        async with inflight_bytes.reserve(min(expected, MAX_PAGE_BYTES + 1)) as reservation:
+            chunks, size = [], 0
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > reservation.size:
+                    await reservation.grow_to(min(MAX_PAGE_BYTES + 1, max(size, 2 * reservation.size)))
+                if size > MAX_PAGE_BYTES:
+                    break
+            body = b"".join(chunks)[:MAX_PAGE_BYTES + 1]
+            del chunks
+            yield response, body
+
+# Upstream connections: scrapes share one pooled client per worker (building a
+# client costs ~40 ms of CPU for its TLS context) whose connections resolve
+# host names through a DNS cache. Entries live DNS_CACHE_TTL seconds; an
+# expired entry is still used while it is re-resolved in the background, and
+# kept when re-resolving fails. After startup, UPSTREAM_PREWARM_CONNECTIONS
+# keep-alive connections are opened to each of UPSTREAM_PREWARM_HOSTS.
+DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "200"))
+UPSTREAM_KEEPALIVE_CONNECTIONS = int(os.getenv("UPSTREAM_KEEPALIVE_CONNECTIONS", "50"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "60"))
+UPSTREAM_PREWARM_HOSTS = [host.strip() for host in os.getenv(
+    "UPSTREAM_PREWARM_HOSTS", "cdn.syndication.twimg.com,nitter.net,publish.twitter.com,x.com"
+).split(",") if host.strip()]
+UPSTREAM_PREWARM_CONNECTIONS = int(os.getenv("UPSTREAM_PREWARM_CONNECTIONS", "2"))
+
+class DNSCache:
+    """Host name -> resolved addresses, refreshed in the background once DNS_CACHE_TTL has passed"""
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.entries = {}  # (host, port) -> (addresses, expires_at)
+        self.refreshing = {}
+        self.hits = 0
+        self.misses = 0
+        self.refresh_failures = 0
+    
+    async def lookup(self, host: str, port: int) -> list:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self.entries[(host, port)] = (addresses, time.monotonic() + self.ttl)
+        return addresses
+    
+    async def refresh(self, host: str, port: int):
+        try:
+            await self.lookup(host, port)
+        except OSError:
+            # Keep serving the old addresses while the resolver is unavailable
+            self.refresh_failures += 1
+        finally:
+            self.refreshing.pop((host, port), None)
+    
+    async def resolve(self, host: str, port: int) -> list:
+        entry = self.entries.get((host, port))
+        if entry is None:
+            self.misses += 1
+            return await self.lookup(host, port)
+        self.hits += 1
+        addresses, expires_at = entry
+        if time.monotonic() >= expires_at and (host, port) not in self.refreshing:
+            self.refreshing[(host, port)] = asyncio.ensure_future(self.refresh(host, port))
+        return addresses
+    
+    def stats(self) -> dict:
+        return {
+            "ttl_s": self.ttl,
+            "hosts": sorted(f"{host}:{port}" for host, port in self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refresh_failures": self.refresh_failures,
+        }
+
+dns_cache = DNSCache(DNS_CACHE_TTL)
+
+class CachedDNSNetworkBackend:
+    """httpcore network backend that connects to addresses from dns_cache.
+    
+    TLS still verifies and sends SNI for the original host name, which
+    httpcore takes from the request URL, not from the connected address.
+    """
+    
+    def __init__(self):
+        self.backend = httpcore.AnyIOBackend()
+    
+    async def connect_tcp(self, host: str, port: int, timeout=None, local_address=None, socket_options=None):
+        try:
+            ipaddress.ip_address(host)
+            addresses = [host]
+        except ValueError:
+            try:
+                addresses = await dns_cache.resolve(host, port)
+            except OSError as exc:
+                # httpx only maps httpcore errors to httpx.RequestError: an unresolvable
+                # host must fail like a refused connection so the next source is tried
+                raise httpcore.ConnectError(f"could not resolve {host}: {exc}") from exc
+            if not addresses:
+                raise httpcore.ConnectError(f"no addresses for {host}")
+        for address in addresses[:-1]:
+            try:
+                return await self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                continue
+        return await self.backend.connect_tcp(addresses[-1], port, timeout, local_address, socket_options)
+    
+    async def connect_unix_socket(self, path: str, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+    
+    async def sleep(self, seconds: float):
+        await self.backend.sleep(seconds)
+
+def cached_dns_transport(limits: httpx.Limits) -> httpx.AsyncHTTPTransport:
+    transport = httpx.AsyncHTTPTransport(limits=limits)
+    # httpx has no option for the network backend of its connection pool
+    transport._pool._network_backend = CachedDNSNetworkBackend()
+    return transport
+
+# Scraping sessions must not leak into each other, so the shared client keeps no cookies
+upstream_client: Optional[httpx.AsyncClient] = None
+
+def get_upstream_client() -> httpx.AsyncClient:
+    global upstream_client
+    if upstream_client is None:
+        limits = httpx.Limits(
+            max_connections=UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=UPSTREAM_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY
+        )
+        upstream_client = httpx.AsyncClient(
+            follow_redirects=True,
+            cookies=http.cookiejar.CookieJar(http.cookiejar.DefaultCookiePolicy(allowed_domains=[])),
+            transport=cached_dns_transport(limits)
+        )
+    return upstream_client
+
+@app.on_event("shutdown")
+async def close_upstream_client():
+    if upstream_client is not None:
+        await upstream_client.aclose()
+
+async def prewarm_upstreams():
+    """Resolve the top source hosts and open keep-alive connections to them"""
+    client = get_upstream_client()
+    
+    async def open_connection(host: str):
+        try:
+            await client.head(upstream_url(f"https://{host}/"), headers=get_scraping_headers(), timeout=SCRAPE_TIMEOUT)
+        except httpx.HTTPError:
+            pass
+    
+    await asyncio.gather(*(
+        open_connection(host) for host in UPSTREAM_PREWARM_HOSTS for _ in range(UPSTREAM_PREWARM_CONNECTIONS)
+    ))
+
+# x.com JSON API: an anonymous guest session (the public web-app bearer token
+# plus a guest token from guest/activate) unlocks the compact GraphQL
+# TweetResultByRestId lookup. Guest tokens are shared by all requests of a
+# worker and refreshed when they expire or the API stops accepting them.
+X_API_HOST = "api.x.com"
+X_GUEST_ENABLED = os.getenv("X_GUEST_ENABLED", "1") == "1"
+X_GUEST_BEARER_TOKEN = os.getenv(
+    "X_GUEST_BEARER_TOKEN",
+    "AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs%3D1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA"
+)
+X_GUEST_TOKEN_TTL = float(os.getenv("X_GUEST_TOKEN_TTL", "9000"))
+X_GUEST_ACTIVATE_BACKOFF = float(os.getenv("X_GUEST_ACTIVATE_BACKOFF", "60"))
+X_TWEET_QUERY_ID = os.getenv("X_TWEET_QUERY_ID", "0hWvDhmW8YQ-S_ib3azIrw")
+X_TWEET_FEATURES = {
+    "creator_subscriptions_tweet_preview_api_enabled": True,
+    "tweetypie_unmention_optimization_enabled": True,
+    "responsive_web_edit_tweet_api_enabled": True,
+    "graphql_is_translatable_rweb_tweet_is_translatable_enabled": True,
+    "view_counts_everywhere_api_enabled": True,
+    "longform_notetweets_consumption_enabled": True,
+    "responsive_web_twitter_article_tweet_consumption_enabled": False,
+    "tweet_awards_web_tipping_enabled": False,
+    "freedom_of_speech_not_reach_fetch_enabled": True,
+    "standardized_nudges_misinfo": True,
+    "tweet_with_visibility_results_prefer_gql_limited_actions_policy_enabled": True,
+    "longform_notetweets_rich_text_read_enabled": True,
+    "longform_notetweets_inline_media_enabled": True,
+    "responsive_web_graphql_exclude_directive_enabled": True,
+    "verified_phone_label_enabled": False,
+    "responsive_web_media_download_video_enabled": False,
+    "responsive_web_graphql_skip_user_profile_image_extensions_enabled": False,
+    "responsive_web_graphql_timeline_navigation_enabled": True,
+    "responsive_web_enhance_cards_enabled": False,
+}
+
+def x_tweet_lookup_url(tweet_id: str) -> str:
+    variables = {"tweetId": tweet_id, "withCommunity": False, "includePromotedContent": False, "withVoice": False}
+    return f"https://{X_API_HOST}/graphql/{X_TWEET_QUERY_ID}/TweetResultByRestId?" + urlencode({
+        "variables": json.dumps(variables, separators=(",", ":")),
+        "features": json.dumps(X_TWEET_FEATURES, separators=(",", ":")),
+    })
+
+class GuestSession:
+    """Guest token for the x.com JSON API, activated once and shared by concurrent requests"""
+    
+    def __init__(self, bearer_token: str, ttl: float, activate_backoff: float):
+        self.bearer_token = bearer_token
+        self.ttl = ttl
+        self.activate_backoff = activate_backoff
+        self.token: Optional[str] = None
+        self.expires_at = 0.0
+        self.retry_at = 0.0
+        self.lock = asyncio.Lock()
+        self.counters = {"activations": 0, "activation_failures": 0, "invalidations": 0}
+    
+    def valid(self) -> bool:
+        return self.token is not None and time.monotonic() < self.expires_at
+    
+    async def activate(self):
+        headers = {
+            "Authorization": f"Bearer {self.bearer_token}",
+            "User-Agent": random.choice(USER_AGENTS),
+        }
+        url = f"https://{X_API_HOST}/1.1/guest/activate.json"
+        try:
+            async with upstream_page(get_upstream_client(), url, headers, method="POST") as (response, body):
+                token = json.loads(body).get("guest_token") if response.status_code == 200 else None
+        except (httpx.HTTPError, ValueError, AttributeError):
+            token = None
+        
+        if not token:
+            # Do not hammer the activation endpoint while it refuses us
+            self.counters["activation_failures"] += 1
+            self.retry_at = time.monotonic() + self.activate_backoff
+            return
+        self.counters["activations"] += 1
+        self.token = str(token)
+        self.expires_at = time.monotonic() + self.ttl
+    
+    async def headers(self) -> Optional[dict]:
+        """Auth headers for a lookup, or None while no guest token can be had"""
+        if not self.valid():
+            async with self.lock:
+                # Another request may have activated a token while we waited
+                if not self.valid() and time.monotonic() >= self.retry_at:
+                    await self.activate()
+            if not self.valid():
+                return None
+        return {
+            "Authorization": f"Bearer {self.bearer_token}",
+            "x-guest-token": self.token,
+            "Content-Type": "application/json",
+        }
+    
+    def invalidate(self, token: Optional[str]):
+        """Drop a token the API rejected, unless it was already replaced"""
+        if token is not None and token == self.token:
+            self.counters["invalidations"] += 1
+            self.token = None
+    
+    def stats(self) -> dict:
+        return {"enabled": True, "active": self.valid(), **self.counters}
+
+x_guest_session = GuestSession(X_GUEST_BEARER_TOKEN, X_GUEST_TOKEN_TTL, X_GUEST_ACTIVATE_BACKOFF) if X_GUEST_ENABLED else None
+
+# Tweet IDs are Snowflakes: milliseconds since the Twitter epoch in the bits
+# above 22. IDs up to LAST_SEQUENTIAL_TWEET_ID were issued sequentially before
+# Snowflake (Nov 2010) and carry no timestamp.
+SNOWFLAKE_EPOCH_MS = 1288834974657
+LAST_SEQUENTIAL_TWEET_ID = 29_999_999_999
+MAX_TWEET_ID = 2**63 - 1
+# Allowed drift between our clock and Twitter's when rejecting future IDs
+SNOWFLAKE_CLOCK_SKEW_MS = int(os.getenv("SNOWFLAKE_CLOCK_SKEW_MS", "300000"))
+
+def snowflake_timestamp_ms(tweet_id: str) -> Optional[int]:
+    """Creation time encoded in a tweet ID in Unix milliseconds, None for pre-Snowflake IDs"""
+    value = int(tweet_id)
+    if value <= LAST_SEQUENTIAL_TWEET_ID:
+        return None
+    return (value >> 22) + SNOWFLAKE_EPOCH_MS
+
+def snowflake_created_at(tweet_id: str) -> str:
+    """Creation time of a tweet as ISO 8601 UTC, derived from its ID alone ("" if undated)"""
+    timestamp_ms = snowflake_timestamp_ms(tweet_id)
+    if timestamp_ms is None:
+        return ""
+    created = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+    return created.strftime("%Y-%m-%dT%H:%M:%S.") + f"{timestamp_ms % 1000:03d}Z"
+
+# ASCII digits only (str.isdigit and \d accept '²' and other Unicode digits),
+# and at most 19 of them, the length of the largest 63-bit ID
+TWEET_ID_PATTERN = re.compile(r'[0-9]{1,19}')
+
+def validate_tweet_id(tweet_id: str) -> str:
+    """Reject IDs that no tweet can have (not 1-19 ASCII digits, zero, over 63 bits, or minted in the future)"""
+    if not TWEET_ID_PATTERN.fullmatch(tweet_id):
+        raise HTTPException(status_code=400, detail="Invalid tweet ID")
+    value = int(tweet_id)
+    if value == 0 or value > MAX_TWEET_ID:
+        raise HTTPException(status_code=400, detail="Invalid tweet ID")
+    timestamp_ms = snowflake_timestamp_ms(tweet_id)
+    if timestamp_ms is not None and timestamp_ms > time.time() * 1000 + SNOWFLAKE_CLOCK_SKEW_MS:
+        raise HTTPException(status_code=400, detail="Invalid tweet ID: creation time is in the future")
+    return tweet_id
+
+def tweeted_after(tweet_id: str, start_time: float) -> bool:
+    """Whether a tweet was posted at or after start_time (Unix seconds), decided from its ID.
     
-    for pattern in url_patterns:
-        match = re.search(pattern, tweet_input)
-        if match:
-            return match.group(1)
+    Pre-Snowflake tweets predate every event, so they never qualify.
+    """
+    timestamp_ms = snowflake_timestamp_ms(tweet_id)
+    return timestamp_ms is not None and timestamp_ms >= start_time * 1000
+
+# x.com / twitter.com status URLs; the username is absent for /i/web/status/ links
+TWEET_URL_PATTERN = re.compile(
+    r'https?://(?:www\.|mobile\.)?(?:twitter|x)\.com/(?:i/web|([A-Za-z0-9_]{1,15}))/status(?:es)?/([0-9]+)'
+)
+
+def extract_tweet_ref(tweet_input: str) -> tuple:
+    """Extract (tweet ID, author username or None) from a URL or a bare ID"""
+    match = TWEET_URL_PATTERN.search(tweet_input)
+    if match:
+        username = match.group(1)
+        return validate_tweet_id(match.group(2)), username if username and username != "i" else None
     
     # If no URL pattern matched, assume it's already a tweet ID
     if tweet_input.isdigit():
-        return tweet_input
+        return validate_tweet_id(tweet_input), None
     
     raise HTTPException(status_code=400, detail="Invalid tweet URL or ID format")
 
-async def scrape_tweet_from_twitter(tweet_id: str) -> TweetData:
-    """Scrape tweet data from Twitter/X webpage"""
-    try:
-        # Construct the tweet URL - try different approaches
-        urls_to_try = [
-            # Try direct nitter instances first (better for scraping)
-            f"https://nitter.net/i/status/{tweet_id}",
-            f"https://nitter.poast.org/i/status/{tweet_id}",
-            f"https://nitter.privacydev.net/i/status/{tweet_id}",
-            # Try public Twitter embeds (no auth needed)
-            f"https://publish.twitter.com/oembed?url=https://twitter.com/i/web/status/{tweet_id}",
-            # Try Twitter API URL (sometimes has JSON data)
-            f"https://api.twitter.com/1.1/statuses/show/{tweet_id}.json",
-            # Try syndication API (public, no auth needed)
-            f"https://syndication.twitter.com/srv/timeline-profile/screen-name/twitter?include_entities=true&include_available_features=1&include_entities=1&tweet_id={tweet_id}",
-            # Try X/Twitter web URLs
-            f"https://x.com/i/web/status/{tweet_id}",
-            f"https://twitter.com/i/web/status/{tweet_id}",
-            f"https://x.com/twitter/status/{tweet_id}",
+def extract_tweet_id(tweet_input: str) -> str:
+    """Extract tweet ID from URL or return as-is if already an ID"""
+    return extract_tweet_ref(tweet_input)[0]
+
+JS_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+def js_number_to_radix(value: float, radix: int) -> str:
+    """Number.prototype.toString(radix) for a small positive double, digit for digit as V8 prints it"""
+    integer = math.floor(value)
+    fraction = value - integer
+    # Fractional digits only go as far as the double's own precision
+    delta = max(0.5 * (math.nextafter(value, math.inf) - value), math.nextafter(0.0, 1.0))
+    fraction_digits = []
+    while fraction >= delta:
+        fraction *= radix
+        delta *= radix
+        digit = int(fraction)
+        fraction_digits.append(digit)
+        fraction -= digit
+        # Round half to even, carrying into earlier digits when needed
+        if (fraction > 0.5 or (fraction == 0.5 and digit & 1)) and fraction + delta > 1:
+            while True:
+                if not fraction_digits:
+                    integer += 1
+                    break
+                last = fraction_digits.pop()
+                if last + 1 < radix:
+                    fraction_digits.append(last + 1)
+                    break
+            break
+    
+    integer_digits = ""
+    integer = int(integer)
+    while True:
+        integer, remainder = divmod(integer, radix)
+        integer_digits = JS_DIGITS[remainder] + integer_digits
+        if integer == 0:
+            break
+    if not fraction_digits:
+        return integer_digits
+    return integer_digits + "." + "".join(JS_DIGITS[digit] for digit in fraction_digits)
+
+def syndication_token(tweet_id: str) -> str:
+    """Token the tweet-result endpoint expects, derived like the embed widget does:
+    ((id / 1e15) * Math.PI).toString(36) with zeros and the point removed
+    """
+    return re.sub(r'0+|\.', '', js_number_to_radix(float(int(tweet_id)) / 1e15 * math.pi, 36))
+
+def tweet_source_urls(tweet_id: str, username: Optional[str] = None) -> list:
+    """Upstream URLs to try for a tweet, cheapest first.
+    
+    The single-tweet syndication JSON answers most lookups in one small
+    request, then the x.com guest API lookup; canonical author URLs follow
+    when the author is known.
+    """
+    urls = [
+        f"https://cdn.syndication.twimg.com/tweet-result?id={tweet_id}&lang=en&token={syndication_token(tweet_id)}",
+    ]
+    if x_guest_session is not None:
+        urls.append(x_tweet_lookup_url(tweet_id))
+    if username:
+        urls += [
+            f"https://nitter.net/{username}/status/{tweet_id}",
+            f"https://x.com/{username}/status/{tweet_id}",
         ]
+    return urls + [
+        # Try direct nitter instances first (better for scraping)
+        f"https://nitter.net/i/status/{tweet_id}",
+        f"https://nitter.poast.org/i/status/{tweet_id}",
+        f"https://nitter.privacydev.net/i/status/{tweet_id}",
+        # Try public Twitter embeds (no auth needed)
+        f"https://publish.twitter.com/oembed?url=https://twitter.com/i/web/status/{tweet_id}",
+        # Try Twitter API URL (sometimes has JSON data)
+        f"https://api.twitter.com/1.1/statuses/show/{tweet_id}.json",
+        # Try syndication API (public, no auth needed)
+        f"https://syndication.twitter.com/srv/timeline-profile/screen-name/twitter?include_entities=true&include_available_features=1&include_entities=1&tweet_id={tweet_id}",
+        # Try X/Twitter web URLs
+        f"https://x.com/i/web/status/{tweet_id}",
+        f"https://twitter.com/i/web/status/{tweet_id}",
+    ]
+
+def usable_result(tweet_data: Optional[TweetRecord]) -> bool:
+    return bool(tweet_data and tweet_data.exists and tweet_data.tweetText != "Tweet exists but content could not be extracted")
+
+def extract_from_response(url: str, tweet_id: str, content_type: str, text: str) -> Optional[TweetRecord]:
+    """Extract the tweet from one upstream 200 response; None if it is not usable"""
+    # Check if this is a JSON response (from API endpoints)
+    if content_type.startswith('application/json'):
+        json_data = parse_json_body(text)
+        extractor = json_extractor_for(url)
+        if json_data is not None:
+            tweet_data = extractor(json_data, tweet_id)
+            if usable_result(tweet_data):
+                return tweet_data
+        if extractor is not extract_tweet_data_from_json:
+            # A dedicated JSON source has no HTML to fall back to
+            return None
+        # Otherwise fall back to HTML parsing
+    
+    html_content = limit_page_size(text)
+    
+    # Parse the HTML
+    soup = bs4.BeautifulSoup(html_content, 'html.parser')
+    
+    # Try to extract tweet data from various sources
+    try:
+        tweet_data = extract_tweet_data_from_html(soup, tweet_id, url)
+    finally:
+        # Free the tree now: it is full of reference cycles that would
+        # otherwise wait for the garbage collector, at ~10x the page size
+        soup.decompose()
+    return tweet_data if usable_result(tweet_data) else None
+
+async def scrape_source(url: str, tweet_id: str) -> Optional[TweetRecord]:
+    """Fetch one upstream URL and extract the tweet; None if this source did not yield it"""
+    # The x.com guest API gets one retry with a fresh guest token
+    for attempt in range(2 if urlparse(url).hostname == X_API_HOST else 1):
+        headers = get_scraping_headers()
+        guest_token = None
+        if urlparse(url).hostname == X_API_HOST:
+            auth_headers = await x_guest_session.headers()
+            if auth_headers is None:
+                return None
+            headers.update(auth_headers)
+            guest_token = auth_headers["x-guest-token"]
         
-        # Also try to guess username from tweet ID by checking common patterns
-        # We'll try some common usernames that might have this tweet
-        common_usernames = ["twitter", "x", "elonmusk", "jack", "verified"]
-        for username in common_usernames:
-            urls_to_try.append(f"https://nitter.net/{username}/status/{tweet_id}")
-            urls_to_try.append(f"https://x.com/{username}/status/{tweet_id}")
+        # Add small random delay to avoid rate limiting
+        if SCRAPE_DELAY_MAX > 0:
+            await asyncio.sleep(random.uniform(SCRAPE_DELAY_MIN, SCRAPE_DELAY_MAX))
+        
+        async with upstream_page(get_upstream_client(), url, headers) as (response, body):
+            if response.status_code == 200:
+                content_type = response.headers.get('content-type', '')
+                if raw_archive is not None:
+                    await raw_archive.put_async(tweet_id, url, content_type, body)
+                text = body.decode(response.encoding or "utf-8", errors="replace")
+                return extract_from_response(url, tweet_id, content_type, text)
+        
+        if response.status_code == 429 and guest_token:
+            # Rate limited guest token; the next lookup activates a new one
+            x_guest_session.invalidate(guest_token)
+        elif response.status_code in (401, 403) and guest_token:
+            # Guest token expired or revoked: activate a new one and retry
+            x_guest_session.invalidate(guest_token)
+            continue
+        # 404 (not found), 429 (rate limited) and others: try the next source
+        return None
+    return None
+
+async def scrape_tweet_from_twitter(tweet_id: str, username: Optional[str] = None) -> TweetRecord:
+    """Scrape tweet data from Twitter/X webpage"""
+    try:
+        # The author from the submitted URL or the author index leads straight
+        # to the canonical status page; otherwise only ID-addressed URLs are tried
+        if author_index is not None:
+            username = await author_index.get_async(tweet_id) or username
+        urls_to_try = tweet_source_urls(tweet_id, username)
         
         for url in urls_to_try:
             try:
-                headers = get_scraping_headers()
-                
-                # Add small random delay to avoid rate limiting
-                await asyncio.sleep(random.uniform(0.5, 2.0))
-                
-                async with httpx.AsyncClient(
-                    timeout=30.0,
-                    follow_redirects=True,
-                    headers=headers
-                ) as client:
-                    response = await client.get(url)
-                    
-                    if response.status_code == 200:
-                        # Check if this is a JSON response (from API endpoints)
-                        if response.headers.get('content-type', '').startswith('application/json'):
-                            try:
-                                json_data = response.json()
-                                tweet_data = extract_tweet_data_from_json(json_data, tweet_id)
-                                if tweet_data and tweet_data.exists and tweet_data.tweetText != "Tweet exists but content could not be extracted":
-                                    return tweet_data
-                            except json.JSONDecodeError:
-                                pass  # Fall back to HTML parsing
-                        
-                        html_content = response.text
-                        
-                        # Parse the HTML
-                        soup = BeautifulSoup(html_content, 'html.parser')
-                        
-                        # Try to extract tweet data from various sources
-                        tweet_data = extract_tweet_data_from_html(soup, tweet_id, url)
-                        
-                        if tweet_data and tweet_data.exists and tweet_data.tweetText != "Tweet exists but content could not be extracted":
-                            return tweet_data
-                        
-                    elif response.status_code == 404:
-                        # Tweet not found, try next URL
-                        continue
-                        
-                    elif response.status_code == 429:
-                        # Rate limited, try next URL
-                        continue
-                        
+                tweet_data = await scrape_source(url, tweet_id)
+                if tweet_data is not None:
+                    return tweet_data
             except httpx.RequestError:
                 # Try next URL
                 continue
         
         # If we reach here, tweet wasn't found on any URL
-        return TweetData(
+        return TweetRecord(
             tweetId=tweet_id,
             authorUsername="unknown",
             tweetText="",
@@ -170,7 +1675,7 @@ async def scrape_tweet_from_twitter(tweet_id: str) -> TweetData:
                 
     except Exception as e:
         # Return as non-existent rather than error to maintain API compatibility
-        return TweetData(
+        return TweetRecord(
             tweetId=tweet_id,
             authorUsername="unknown", 
             tweetText="",
@@ -179,7 +1684,454 @@ async def scrape_tweet_from_twitter(tweet_id: str) -> TweetData:
             timestamp=0
         )
 
-def extract_tweet_data_from_json(json_data, tweet_id: str) -> TweetData:
+# Quorum mode: K independent sources are fetched concurrently and a result
+# counts only when K of them agree on the normalized text and author. Mirrors
+# of the same backend (nitter instances, x.com/twitter.com pages) count as one.
+QUORUM_MAX = 4
+SOURCE_FAMILIES = {
+    "cdn.syndication.twimg.com": "syndication",
+    X_API_HOST: "x_api",
+    "publish.twitter.com": "oembed",
+    "api.twitter.com": "api_v1",
+    "syndication.twitter.com": "syndication_timeline",
+    "x.com": "x_html",
+    "twitter.com": "x_html",
+}
+
+def source_family(url: str) -> str:
+    host = urlparse(url).hostname or ""
+    return "nitter" if host.startswith("nitter.") else SOURCE_FAMILIES.get(host, host)
+
+def normalize_tweet_text(text: str) -> str:
+    """Text as sources agree on it: entities decoded, NFKC, links dropped, whitespace collapsed, casefolded"""
+    text = unicodedata.normalize("NFKC", html.unescape(text))
+    text = re.sub(r'https?://\S+|pic\.twitter\.com/\S+', '', text)
+    return " ".join(text.split()).casefold()
+
+def keccak_round_constants() -> list:
+    """Iota constants of Keccak-f[1600], from the LFSR in the Keccak reference"""
+    constants, lfsr = [], 1
+    for _ in range(24):
+        constant = 0
+        for j in range(7):
+            lfsr = ((lfsr << 1) ^ ((lfsr >> 7) * 0x71)) % 256
+            if lfsr & 2:
+                constant |= 1 << ((1 << j) - 1)
+        constants.append(constant)
+    return constants
+
+KECCAK_ROUND_CONSTANTS = keccak_round_constants()
+KECCAK_LANE_MASK = (1 << 64) - 1
+
+def keccak_rho_pi() -> list:
+    """(source lane, destination lane, rotation) of the rho and pi steps, lane (x, y) at x + 5*y"""
+    rotations = {(0, 0): 0}
+    x, y = 1, 0
+    for t in range(24):
+        rotations[x, y] = (t + 1) * (t + 2) // 2 % 64
+        x, y = y, (2 * x + 3 * y) % 5
+    return [(x + 5 * y, y + 5 * ((2 * x + 3 * y) % 5), rotation) for (x, y), rotation in rotations.items()]
+
+KECCAK_RHO_PI = keccak_rho_pi()
+
+def keccak_f1600(state: list):
+    """The Keccak permutation, in place on 25 little-endian 64-bit lanes"""
+    moved = [0] * 25
+    for round_constant in KECCAK_ROUND_CONSTANTS:
+        # theta
+        parity = [state[x] ^ state[x + 5] ^ state[x + 10] ^ state[x + 15] ^ state[x + 20] for x in range(5)]
+        for x in range(5):
+            right = parity[(x + 1) % 5]
+            d = parity[(x + 4) % 5] ^ (((right << 1) | (right >> 63)) & KECCAK_LANE_MASK)
+            for lane in range(x, 25, 5):
+                state[lane] ^= d
+        # rho and pi
+        for source, destination, rotation in KECCAK_RHO_PI:
+            lane = state[source]
+            moved[destination] = ((lane << rotation) | (lane >> (64 - rotation))) & KECCAK_LANE_MASK
+        # chi
+        for y in range(0, 25, 5):
+            a, b, c, d, e = moved[y:y + 5]
+            state[y:y + 5] = (a ^ (~b & c), b ^ (~c & d), c ^ (~d & e), d ^ (~e & a), e ^ (~a & b))
+        # iota
+        state[0] ^= round_constant
+
+def keccak256(data: bytes) -> bytes:
+    """Solidity's keccak256: original Keccak padding, so not hashlib.sha3_256"""
+    rate = 136
+    padded = bytearray(data) + b"\x01" + bytes(-(len(data) + 1) % rate)
+    padded[-1] |= 0x80
+    state = [0] * 25
+    for offset in range(0, len(padded), rate):
+        for i in range(rate // 8):
+            state[i] ^= int.from_bytes(padded[offset + 8 * i:offset + 8 * i + 8], "little")
+        keccak_f1600(state)
+    return b"".join(lane.to_bytes(8, "little") for lane in state[:4])
+
+# contentHash of tweets that do not exist: bytes32(0)
+EMPTY_COMMITMENT = "0x" + "00" * 32
+
+def content_commitment(author: str, text: str) -> tuple:
+    """(contentHash, preimage) of a tweet's author and text.
+    
+    contentHash is keccak256(abi.encodePacked(author, "\\n", text)) over the
+    casefolded author and normalize_tweet_text(text), so sources that differ
+    only in link and whitespace rendering commit to the same hash.
+    """
+    preimage = f"{author.casefold()}\n{normalize_tweet_text(text)}"
+    return "0x" + keccak256(preimage.encode("utf-8")).hex(), preimage
+
+def quorum_key(tweet_data: TweetRecord) -> tuple:
+    # Sources differ in where they put whitespace around links and hashtags, so it is ignored
+    return tweet_data.authorUsername.casefold(), normalize_tweet_text(tweet_data.tweetText).replace(" ", "")
+
+async def scrape_source_quietly(url: str, tweet_id: str) -> Optional[TweetRecord]:
+    try:
+        return await scrape_source(url, tweet_id)
+    except Exception:
+        return None
+
+async def scrape_with_quorum(tweet_id: str, username: Optional[str], quorum: int) -> tuple:
+    """(TweetRecord, quorum report) from concurrent fetches of independent sources.
+    
+    Starts `quorum` sources at once and starts another only when agreement is
+    no longer reachable with the fetches still running, so a clean run costs
+    exactly `quorum` fetches in the time of the slowest of them.
+    """
+    if author_index is not None:
+        username = await author_index.get_async(tweet_id) or username
+    candidates, families = [], set()
+    for url in tweet_source_urls(tweet_id, username):
+        if source_family(url) not in families:
+            families.add(source_family(url))
+            candidates.append(url)
+    
+    pending = {}
+    groups = {}
+    answered = []
+    next_candidate = iter(enumerate(candidates))
+    winner = None
+    try:
+        while True:
+            largest = max((len(group) for group in groups.values()), default=0)
+            while len(pending) < quorum - largest:
+                order, url = next(next_candidate, (None, None))
+                if url is None:
+                    break
+                task = asyncio.ensure_future(scrape_source_quietly(url, tweet_id))
+                pending[task] = (order, source_family(url))
+            if not pending:
+                break
+            
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                order, family = pending.pop(task)
+                answered.append(family)
+                tweet_data = task.result()
+                if tweet_data is not None:
+                    groups.setdefault(quorum_key(tweet_data), []).append((order, family, tweet_data))
+            winner = next((group for group in groups.values() if len(group) >= quorum), None)
+            if winner is not None:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    best = winner or max(groups.values(), key=len, default=[])
+    with_result = [family for group in groups.values() for _, family, _ in group]
+    report = {
+        "required": quorum,
+        "agreeing": len(best),
+        "reached": winner is not None,
+        "sources": [family for _, family, _ in best],
+        "disagreeing": [family for group in groups.values() if group is not best for _, family, _ in group],
+        "no_result": [family for family in answered if family not in with_result],
+        # Share of the sources that returned a tweet which back this answer
+        "confidence": round(len(best) / len(with_result), 2) if with_result else 0.0,
+    }
+    best = sorted(best, key=lambda entry: entry[0])
+    if winner is None:
+        return TweetRecord(
+            tweetId=tweet_id,
+            authorUsername="unknown",
+            tweetText="",
+            createdAt="",
+            exists=False,
+            timestamp=0
+        ), report
+    return best[0][2], report
+
+async def fetch_tweet_with_quorum(tweet_id: str, username: Optional[str], quorum: int, lane: str) -> tuple:
+    """Quorum fetch under admission control; confirmed results refresh the cache"""
+    if admission is None:
+        record, report = await scrape_with_quorum(tweet_id, username, quorum)
+    else:
+        async with admission.slot(AdmissionTicket(lane)):
+            record, report = await scrape_with_quorum(tweet_id, username, quorum)
+    
+    if record.exists:
+        record.createdAt = snowflake_created_at(tweet_id) or record.createdAt
+    tweet_data = record.to_model()
+    if tweet_data.exists:
+        if result_cache is not None:
+            await result_cache.put_async(tweet_data)
+        if author_index is not None and record.author_confirmed:
+            await author_index.put_async(tweet_id, tweet_data.authorUsername)
+    return tweet_data, report
+
+# Requests whose client disconnects before the answer is ready are cancelled,
+# together with the scrape tasks they started, and answered with this status
+CLIENT_CLOSED_REQUEST = 499
+disconnect_stats = {"cancelled_requests": 0, "abandoned_fetches": 0}
+
+async def wait_for_disconnect(request: Request):
+    # The endpoints using this take no body, so the next ASGI message is the disconnect
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+async def cancel_on_disconnect(request: Request, awaitable):
+    """Await awaitable, cancelling it if the client disconnects first"""
+    task = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+            # Let the scrape unwind (admission slot released, sockets closed)
+            await asyncio.wait({task})
+    if task.cancelled():
+        disconnect_stats["cancelled_requests"] += 1
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    return task.result()
+
+class InflightFetch:
+    """A running fetch_tweet_locally task shared by every caller waiting for the same tweet"""
+    
+    def __init__(self, task: asyncio.Future, ticket: AdmissionTicket):
+        self.task = task
+        self.ticket = ticket
+        self.waiters = 0
+
+# Tweet ID -> InflightFetch
+inflight_fetches: dict = {}
+
+async def fetch_tweet(
+    tweet_id: str,
+    forwarded: bool = False,
+    lane: str = PRIORITY_DEFAULT_LANE,
+    username: Optional[str] = None
+) -> TweetData:
+    """Get tweet data from the result cache, the owning cluster node or a scrape.
+    
+    username is the author from the submitted URL, if there was one.
+    """
+    if forwarded:
+        cluster_stats["received_forwarded"] += 1
+    elif cluster_ring is not None:
+        owner = cluster_ring.owner(tweet_id)
+        if owner != CLUSTER_SELF_URL:
+            tweet_data = await forward_to_owner(owner, tweet_id, lane, username)
+            if tweet_data is not None:
+                return tweet_data
+            # Owner unreachable: serve the request locally instead of failing it
+    
+    # Concurrent requests for the same tweet (common once the cluster routes
+    # them all to one owner) share a single cache lookup and scrape, which
+    # waits in the highest lane of any of them and runs while any of them waits
+    fetch = inflight_fetches.get(tweet_id)
+    if fetch is not None:
+        if admission is not None:
+            admission.promote(fetch.ticket, lane)
+    else:
+        ticket = AdmissionTicket(lane)
+        fetch = InflightFetch(asyncio.ensure_future(fetch_tweet_locally(tweet_id, ticket, username)), ticket)
+        inflight_fetches[tweet_id] = fetch
+        fetch.task.add_done_callback(lambda _, fetch=fetch: forget_inflight_fetch(tweet_id, fetch))
+    fetch.waiters += 1
+    try:
+        return await asyncio.shield(fetch.task)
+    finally:
+        fetch.waiters -= 1
+        if fetch.waiters == 0 and not fetch.task.done():
+            # Every caller is gone (disconnected): stop scraping for nobody. The
+            # task takes a few awaits to unwind, so it is unlisted first and
+            # callers arriving meanwhile start a fresh fetch instead of joining it
+            disconnect_stats["abandoned_fetches"] += 1
+            forget_inflight_fetch(tweet_id, fetch)
+            fetch.task.cancel()
+
+def forget_inflight_fetch(tweet_id: str, fetch: InflightFetch):
+    # A fetch abandoned while still running may have been replaced by a newer one
+    if inflight_fetches.get(tweet_id) is fetch:
+        del inflight_fetches[tweet_id]
+
+async def fetch_tweet_locally(tweet_id: str, ticket: AdmissionTicket, username: Optional[str]) -> TweetData:
+    if result_cache is not None:
+        cached = await result_cache.get_async(tweet_id)
+        if cached is not None:
+            return cached
+    
+    record = await scrape_with_admission(tweet_id, ticket, username)
+    if record.exists and snowflake_timestamp_ms(tweet_id) is not None:
+        # Sources format dates differently; the ID gives every verifier the same value
+        record.createdAt = snowflake_created_at(tweet_id)
+    tweet_data = record.to_model()
+    if result_cache is not None:
+        await result_cache.put_async(tweet_data)
+    if author_index is not None and tweet_data.exists and record.author_confirmed:
+        # Never learned from guesses: the index outranks the URL the caller submitted
+        await author_index.put_async(tweet_id, tweet_data.authorUsername)
+    return tweet_data
+
+async def scrape_with_admission(tweet_id: str, ticket: AdmissionTicket, username: Optional[str]) -> TweetRecord:
+    """Scrape once admission control grants a slot (raises 503 when overloaded)"""
+    if admission is None:
+        return await scrape_tweet_from_twitter(tweet_id, username)
+    async with admission.slot(ticket):
+        return await scrape_tweet_from_twitter(tweet_id, username)
+
+# Existence-only checks read status codes and redirect targets, never bodies.
+# Each probe answers True (exists), False (gone) or None (inconclusive, try the next).
+NITTER_STATUS_REDIRECT = re.compile(r'/([A-Za-z0-9_]{1,15})/status/(\d+)')
+
+async def probe_oembed(client: httpx.AsyncClient, tweet_id: str):
+    url = f"https://publish.twitter.com/oembed?url=https://twitter.com/i/web/status/{tweet_id}"
+    async with timed_upstream_stream(client, url) as response:
+        if response.status_code == 200:
+            return True, None
+        # 404: deleted or never existed; 403: protected or suspended, unusable as a proof
+        if response.status_code in (403, 404):
+            return False, None
+    return None, None
+
+async def probe_nitter_redirect(client: httpx.AsyncClient, tweet_id: str):
+    url = f"https://nitter.net/i/status/{tweet_id}"
+    async with timed_upstream_stream(client, url) as response:
+        if response.status_code in (301, 302, 303, 307, 308):
+            # /i/status/<id> redirects to the canonical /<user>/status/<id> of an existing tweet
+            match = NITTER_STATUS_REDIRECT.search(response.headers.get("location", ""))
+            if match and match.group(2) == tweet_id:
+                return True, match.group(1)
+        elif response.status_code == 200:
+            return True, None
+        elif response.status_code == 404:
+            return False, None
+    return None, None
+
+EXISTENCE_PROBES = [("oembed", probe_oembed), ("nitter", probe_nitter_redirect)]
+
+# Pooled client for existence probes: building a client costs ~40 ms of CPU
+# (TLS context), far more than the probe itself (created on first use)
+probe_client: Optional[httpx.AsyncClient] = None
+
+def get_probe_client() -> httpx.AsyncClient:
+    global probe_client
+    if probe_client is None:
+        probe_client = httpx.AsyncClient(
+            timeout=SCRAPE_TIMEOUT,
+            follow_redirects=False,
+            transport=cached_dns_transport(httpx.Limits(max_connections=200, max_keepalive_connections=50))
+        )
+    return probe_client
+
+@app.on_event("shutdown")
+async def close_probe_client():
+    if probe_client is not None:
+        await probe_client.aclose()
+
+async def check_tweet_exists(tweet_id: str, lane: str = PRIORITY_DEFAULT_LANE) -> dict:
+    """Whether a tweet exists, from a cached result or the first conclusive probe"""
+    if result_cache is not None:
+        cached = await result_cache.get_async(tweet_id)
+        if cached is not None:
+            return {"exists": cached.exists, "source": "cache", "author": cached.authorUsername if cached.exists else None}
+    
+    async with contextlib.AsyncExitStack() as stack:
+        if admission is not None:
+            await stack.enter_async_context(admission.slot(AdmissionTicket(lane)))
+        for source, probe in EXISTENCE_PROBES:
+            try:
+                exists, author = await probe(get_probe_client(), tweet_id)
+            except httpx.RequestError:
+                continue
+            if exists is not None:
+                if exists and author and author_index is not None:
+                    await author_index.put_async(tweet_id, author)
+                return {"exists": exists, "source": source, "author": author}
+    
+    raise HTTPException(status_code=502, detail="Could not determine whether the tweet exists")
+
+def extract_tweet_data_from_syndication(json_data, tweet_id: str) -> TweetRecord:
+    """Extract tweet data from a cdn.syndication.twimg.com tweet-result response"""
+    if (isinstance(json_data, dict) and json_data.get('__typename') == 'Tweet'
+            and json_data.get('id_str') == tweet_id and json_data.get('text')):
+        user = json_data.get('user') if isinstance(json_data.get('user'), dict) else {}
+        return TweetRecord(
+            tweetId=tweet_id,
+            authorUsername=user.get('screen_name') or "unknown",
+            tweetText=json_data['text'],
+            createdAt=json_data.get('created_at', ''),
+            exists=True,
+            timestamp=int(time.time()),
+            author_confirmed=bool(user.get('screen_name'))
+        )
+    
+    # Deleted, withheld or unknown tweets come back as a TweetTombstone or {}
+    return TweetRecord(
+        tweetId=tweet_id,
+        authorUsername="unknown",
+        tweetText="",
+        createdAt="",
+        exists=False,
+        timestamp=0
+    )
+
+def extract_tweet_data_from_x_api(json_data, tweet_id: str) -> TweetRecord:
+    """Extract tweet data from an x.com GraphQL TweetResultByRestId response"""
+    try:
+        result = json_data['data']['tweetResult']['result']
+        if result.get('__typename') == 'TweetWithVisibilityResults':
+            result = result['tweet']
+        legacy = result.get('legacy', {})
+        if result.get('__typename', 'Tweet') == 'Tweet' and result.get('rest_id') == tweet_id and legacy.get('full_text'):
+            # Long posts keep their full text in note_tweet; legacy holds a truncated copy
+            note = result.get('note_tweet', {}).get('note_tweet_results', {}).get('result', {})
+            user = result.get('core', {}).get('user_results', {}).get('result', {})
+            username = user.get('core', {}).get('screen_name') or user.get('legacy', {}).get('screen_name')
+            return TweetRecord(
+                tweetId=tweet_id,
+                authorUsername=username or "unknown",
+                tweetText=note.get('text') or legacy['full_text'],
+                createdAt=legacy.get('created_at', ''),
+                exists=True,
+                timestamp=int(time.time()),
+                author_confirmed=bool(username)
+            )
+    except (KeyError, TypeError, AttributeError):
+        pass
+    
+    # Tombstones, TweetUnavailable and empty results
+    return TweetRecord(
+        tweetId=tweet_id,
+        authorUsername="unknown",
+        tweetText="",
+        createdAt="",
+        exists=False,
+        timestamp=0
+    )
+
+# Host -> extractor for JSON sources with a dedicated format; others use extract_tweet_data_from_json
+JSON_SOURCE_EXTRACTORS = {
+    "cdn.syndication.twimg.com": extract_tweet_data_from_syndication,
+    X_API_HOST: extract_tweet_data_from_x_api,
+}
+
+def json_extractor_for(url: str):
+    return JSON_SOURCE_EXTRACTORS.get(urlparse(url).hostname, extract_tweet_data_from_json)
+
+def extract_tweet_data_from_json(json_data, tweet_id: str) -> TweetRecord:
     """Extract tweet data from JSON response"""
     try:
         # Handle different JSON structures
@@ -192,23 +2144,24 @@ def extract_tweet_data_from_json(json_data, tweet_id: str) -> TweetData:
                 created_at = json_data.get('created_at', '')
                 
                 if tweet_text:
-                    return TweetData(
+                    return TweetRecord(
                         tweetId=tweet_id,
                         authorUsername=author_username,
                         tweetText=tweet_text,
                         createdAt=created_at,
                         exists=True,
-                        timestamp=int(time.time())
+                        timestamp=int(time.time()),
+                        author_confirmed=author_username != "unknown"
                     )
             
             # Twitter oEmbed format
             if 'html' in json_data and 'author_name' in json_data:
                 # Parse HTML from oEmbed response
-                from bs4 import BeautifulSoup
-                embed_soup = BeautifulSoup(json_data['html'], 'html.parser')
+                embed_soup = bs4.BeautifulSoup(json_data['html'], 'html.parser')
                 
                 # Extract text from the embed
                 tweet_text = embed_soup.get_text(strip=True)
+                embed_soup.decompose()
                 # Remove common oEmbed artifacts
                 tweet_text = re.sub(r'https?://\S+', '', tweet_text)  # Remove URLs
                 tweet_text = re.sub(r'—\s*\w+\s*\(@\w+\).*', '', tweet_text)  # Remove author line
@@ -219,14 +2172,21 @@ def extract_tweet_data_from_json(json_data, tweet_id: str) -> TweetData:
                     # Extract username from author_name if it contains @
                     if '@' in author_username:
                         author_username = author_username.split('@')[1].split(')')[0]
+                    # author_name is the display name; author_url ends in the actual handle
+                    author_url = json_data.get('author_url')
+                    author_confirmed = False
+                    if isinstance(author_url, str) and USERNAME_PATTERN.match(author_url.rstrip('/').rsplit('/', 1)[-1]):
+                        author_username = author_url.rstrip('/').rsplit('/', 1)[-1]
+                        author_confirmed = True
                     
-                    return TweetData(
+                    return TweetRecord(
                         tweetId=tweet_id,
                         authorUsername=author_username,
                         tweetText=tweet_text,
                         createdAt="",
                         exists=True,
-                        timestamp=int(time.time())
+                        timestamp=int(time.time()),
+                        author_confirmed=author_confirmed
                     )
             
             # Twitter syndication API format
@@ -253,17 +2213,18 @@ def extract_tweet_data_from_json(json_data, tweet_id: str) -> TweetData:
                                                             user_data = tweet.get('core', {}).get('user_results', {}).get('result', {}).get('legacy', {})
                                                             username = user_data.get('screen_name', 'unknown')
                                                             
-                                                            return TweetData(
+                                                            return TweetRecord(
                                                                 tweetId=tweet_id,
                                                                 authorUsername=username,
                                                                 tweetText=tweet_text,
                                                                 createdAt=legacy.get('created_at', ''),
                                                                 exists=True,
-                                                                timestamp=int(time.time())
+                                                                timestamp=int(time.time()),
+                                                                author_confirmed=username != "unknown"
                                                             )
         
         # If we can't parse it as expected, return not found
-        return TweetData(
+        return TweetRecord(
             tweetId=tweet_id,
             authorUsername="unknown",
             tweetText="",
@@ -273,7 +2234,7 @@ def extract_tweet_data_from_json(json_data, tweet_id: str) -> TweetData:
         )
         
     except Exception as e:
-        return TweetData(
+        return TweetRecord(
             tweetId=tweet_id,
             authorUsername="unknown",
             tweetText="",
@@ -282,7 +2243,35 @@ def extract_tweet_data_from_json(json_data, tweet_id: str) -> TweetData:
             timestamp=0
         )
 
-def extract_tweet_data_from_nitter(soup: BeautifulSoup, tweet_id: str, url: str) -> TweetData:
+# Same output as BeautifulSoup's default "minimal" formatter, but escaping with
+# str.replace instead of a Python callback for every '&', '<' and '>' (created on first use)
+fast_minimal_formatter = None
+
+def serialize_soup(soup: bs4.BeautifulSoup) -> str:
+    """Equivalent of str(soup) that stays linear on entity-heavy pages"""
+    global fast_minimal_formatter
+    if fast_minimal_formatter is None:
+        fast_minimal_formatter = bs4.formatter.HTMLFormatter(
+            entity_substitution=lambda text: text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        )
+    return soup.decode(formatter=fast_minimal_formatter)
+
+def find_text_between_tags(page_text: str, min_length: int, max_length: int):
+    """Yield what re.findall('>([^<]{min,max})<') would, in linear time.
+    
+    The regex backtracks up to max_length characters at every '>', which takes
+    minutes on pages made of long runs of '>'.
+    """
+    segments = page_text.split('<')
+    for segment in segments[:-1]:
+        if len(segment) <= min_length:
+            continue
+        # Earliest '>' that leaves between min_length and max_length characters before the '<'
+        start = segment.find('>', max(0, len(segment) - max_length - 1), len(segment) - min_length)
+        if start != -1:
+            yield segment[start + 1:]
+
+def extract_tweet_data_from_nitter(soup: bs4.BeautifulSoup, tweet_id: str, url: str) -> TweetRecord:
     """Extract tweet data specifically from Nitter pages"""
     try:
         # Find the main tweet container
@@ -296,6 +2285,7 @@ def extract_tweet_data_from_nitter(soup: BeautifulSoup, tweet_id: str, url: str)
                 
                 # Get username
                 username_elem = container.select_one('.username')
+                author_confirmed = username_elem is not None
                 if not username_elem:
                     username_elem = container.select_one('.fullname')
                 username = username_elem.get_text(strip=True).replace('@', '') if username_elem else "unknown"
@@ -305,13 +2295,14 @@ def extract_tweet_data_from_nitter(soup: BeautifulSoup, tweet_id: str, url: str)
                 created_at = time_elem.get('title', '') if time_elem else ""
                 
                 if tweet_text and len(tweet_text) > 5:
-                    return TweetData(
+                    return TweetRecord(
                         tweetId=tweet_id,
                         authorUsername=username,
                         tweetText=tweet_text,
                         createdAt=created_at,
                         exists=True,
-                        timestamp=int(time.time())
+                        timestamp=int(time.time()),
+                        author_confirmed=author_confirmed
                     )
         
         # If no tweet found but page loaded, try alternate selectors
@@ -323,7 +2314,7 @@ def extract_tweet_data_from_nitter(soup: BeautifulSoup, tweet_id: str, url: str)
                 username_elem = soup.select_one('.username, .fullname')
                 username = username_elem.get_text(strip=True).replace('@', '') if username_elem else "unknown"
                 
-                return TweetData(
+                return TweetRecord(
                     tweetId=tweet_id,
                     authorUsername=username,
                     tweetText=tweet_text,
@@ -333,8 +2324,8 @@ def extract_tweet_data_from_nitter(soup: BeautifulSoup, tweet_id: str, url: str)
                 )
         
         # If still no content but page seems to be a tweet page
-        if 'status' in url or tweet_id in str(soup):
-            return TweetData(
+        if 'status' in url or tweet_id in serialize_soup(soup):
+            return TweetRecord(
                 tweetId=tweet_id,
                 authorUsername="unknown",
                 tweetText="Tweet exists but content could not be extracted",
@@ -344,7 +2335,7 @@ def extract_tweet_data_from_nitter(soup: BeautifulSoup, tweet_id: str, url: str)
             )
         
         # Tweet not found
-        return TweetData(
+        return TweetRecord(
             tweetId=tweet_id,
             authorUsername="unknown",
             tweetText="",
@@ -354,7 +2345,7 @@ def extract_tweet_data_from_nitter(soup: BeautifulSoup, tweet_id: str, url: str)
         )
         
     except Exception as e:
-        return TweetData(
+        return TweetRecord(
             tweetId=tweet_id,
             authorUsername="unknown",
             tweetText="",
@@ -363,7 +2354,7 @@ def extract_tweet_data_from_nitter(soup: BeautifulSoup, tweet_id: str, url: str)
             timestamp=0
         )
 
-def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -> TweetData:
+def extract_tweet_data_from_html(soup: bs4.BeautifulSoup, tweet_id: str, url: str) -> TweetRecord:
     """Extract tweet data from parsed HTML"""
     try:
         # Special handling for Nitter instances
@@ -377,7 +2368,7 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
                 if isinstance(data, dict) and 'text' in data:
                     author_username = data.get('author', {}).get('url', '').split('/')[-1] if data.get('author') else "unknown"
                     
-                    return TweetData(
+                    return TweetRecord(
                         tweetId=tweet_id,
                         authorUsername=author_username,
                         tweetText=data.get('text', ''),
@@ -407,7 +2398,7 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
                                             tweet_text = obj.get('full_text', obj.get('text', ''))
                                             if tweet_text and len(tweet_text) > 10:
                                                 username = obj.get('user', {}).get('screen_name', 'unknown') if isinstance(obj.get('user'), dict) else "unknown"
-                                                return TweetData(
+                                                return TweetRecord(
                                                     tweetId=tweet_id,
                                                     authorUsername=username,
                                                     tweetText=tweet_text,
@@ -448,16 +2439,7 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
                 if len(url_parts) >= 4:
                     author_username = url_parts[3]  # Usually x.com/username/status/id
             
-            # Also try from original URL
-            if author_username == "unknown":
-                try:
-                    url_parts = url.split('/')
-                    if len(url_parts) >= 4 and url_parts[3] not in ['i', 'twitter']:
-                        author_username = url_parts[3]
-                except:
-                    pass
-            
-            return TweetData(
+            return TweetRecord(
                 tweetId=tweet_id,
                 authorUsername=author_username,
                 tweetText=og_description.get('content', ''),
@@ -471,18 +2453,11 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
         twitter_description = soup.find('meta', attrs={'name': 'twitter:description'})
         
         if twitter_description and twitter_description.get('content'):
-            # Try to extract username from URL
-            author_username = "unknown"
-            try:
-                url_parts = url.split('/')
-                if len(url_parts) >= 4 and url_parts[3] not in ['i', 'twitter']:
-                    author_username = url_parts[3]
-            except:
-                pass
-            
-            return TweetData(
+            # The author is not in these tags, and the requested URL's username
+            # is whatever the caller submitted, so it is left unknown
+            return TweetRecord(
                 tweetId=tweet_id,
-                authorUsername=author_username,
+                authorUsername="unknown",
                 tweetText=twitter_description.get('content', ''),
                 createdAt="",
                 exists=True,
@@ -507,7 +2482,7 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
                         tweet_text = tweet_part.split("'")[1] if "'" in tweet_part and tweet_part.count("'") >= 2 else ""
                     
                     if tweet_text:
-                        return TweetData(
+                        return TweetRecord(
                             tweetId=tweet_id,
                             authorUsername=username,
                             tweetText=tweet_text,
@@ -520,18 +2495,9 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
             if ' / X' in title_text:
                 tweet_text = title_text.replace(' / X', '').strip()
                 if tweet_text:
-                    # Try to get username from URL
-                    author_username = "unknown"
-                    try:
-                        url_parts = url.split('/')
-                        if len(url_parts) >= 4 and url_parts[3] not in ['i', 'twitter']:
-                            author_username = url_parts[3]
-                    except:
-                        pass
-                    
-                    return TweetData(
+                    return TweetRecord(
                         tweetId=tweet_id,
-                        authorUsername=author_username,
+                        authorUsername="unknown",
                         tweetText=tweet_text,
                         createdAt="",
                         exists=True,
@@ -564,18 +2530,9 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
             if elements:
                 tweet_text = elements[0].get_text(strip=True)
                 if tweet_text and len(tweet_text) > 5:  # Filter out very short text
-                    # Try to get username from URL
-                    author_username = "unknown"
-                    try:
-                        url_parts = url.split('/')
-                        if len(url_parts) >= 4 and url_parts[3] not in ['i', 'twitter']:
-                            author_username = url_parts[3]
-                    except:
-                        pass
-                    
-                    return TweetData(
+                    return TweetRecord(
                         tweetId=tweet_id,
-                        authorUsername=author_username,
+                        authorUsername="unknown",
                         tweetText=tweet_text,
                         createdAt="",
                         exists=True,
@@ -583,20 +2540,10 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
                     )
         
         # Method 6: Try to find username from various sources
-        def find_username_from_page(soup_obj, url_str):
-            """Try to find username from various page elements"""
+        def find_username_from_page(soup_obj):
+            """Try to find username from page elements (never from the requested URL)"""
             username = "unknown"
             
-            # Try from URL first
-            try:
-                url_parts = url_str.split('/')
-                if len(url_parts) >= 4 and url_parts[3] not in ['i', 'twitter', 'web']:
-                    username = url_parts[3]
-                    if username != "unknown":
-                        return username
-            except:
-                pass
-            
             # Try from meta tags
             username_selectors = [
                 'meta[name="twitter:site"]',
@@ -644,9 +2591,9 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
                     skip_words = ['cookie', 'privacy', 'terms', 'sign in', 'log in', 'follow', 'retweet', 'like', 'share', 'reply', 'quote', 'bookmark']
                     if not any(skip in line_clean.lower() for skip in skip_words):
                         # This could be tweet content
-                        author_username = find_username_from_page(soup, url)
+                        author_username = find_username_from_page(soup)
                         
-                        return TweetData(
+                        return TweetRecord(
                             tweetId=tweet_id,
                             authorUsername=author_username,
                             tweetText=line_clean,
@@ -656,40 +2603,36 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
                         )
         
         # Method 8: Try to find tweet content by searching for patterns
-        page_text = str(soup)
+        page_text = serialize_soup(soup)
         if tweet_id in page_text:
             # Look for common Twitter text patterns
-            import re
-            
-            # Pattern for tweets in HTML (looking for quoted text)
-            tweet_patterns = [
-                r'"([^"]{20,280})"',  # Quoted text 20-280 chars
-                r"'([^']{20,280})'",  # Single quoted text
-                r'>([^<]{20,280})<',  # Text between tags
+            # Candidates for tweets in HTML (quoted text and text between tags)
+            tweet_candidates = [
+                (m.group(1) for m in re.finditer(r'"([^"]{20,280})"', page_text)),  # Quoted text 20-280 chars
+                (m.group(1) for m in re.finditer(r"'([^']{20,280})'", page_text)),  # Single quoted text
+                find_text_between_tags(page_text, 20, 280),  # Text between tags
             ]
             
-            for pattern in tweet_patterns:
-                matches = re.findall(pattern, page_text)
+            for matches in tweet_candidates:
                 for match in matches:
                     # Filter out common non-tweet content
-                    if not any(skip in match.lower() for skip in ['cookie', 'privacy', 'terms', 'sign', 'follow', 'http', 'www']):
+                    if len(match.strip()) > 15 and not any(skip in match.lower() for skip in ['cookie', 'privacy', 'terms', 'sign', 'follow', 'http', 'www']):
                         # This might be tweet content
-                        username = find_username_from_page(soup, url)
-                        if len(match.strip()) > 15:  # Reasonable tweet length
-                            return TweetData(
-                                tweetId=tweet_id,
-                                authorUsername=username,
-                                tweetText=match.strip(),
-                                createdAt="",
-                                exists=True,
-                                timestamp=int(time.time())
-                            )
+                        username = find_username_from_page(soup)
+                        return TweetRecord(
+                            tweetId=tweet_id,
+                            authorUsername=username,
+                            tweetText=match.strip(),
+                            createdAt="",
+                            exists=True,
+                            timestamp=int(time.time())
+                        )
         
         # Method 9: Simple existence check - if we have basic meta tags, tweet likely exists
         if soup.find('meta', property='og:type', content='article') or \
            soup.find('meta', attrs={'name': 'twitter:card'}) or \
-           'twitter.com' in str(soup) or 'x.com' in str(soup):
-            return TweetData(
+           'twitter.com' in page_text or 'x.com' in page_text:
+            return TweetRecord(
                 tweetId=tweet_id,
                 authorUsername="unknown",
                 tweetText="Tweet exists but content could not be extracted",
@@ -699,7 +2642,7 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
             )
         
         # If none of the methods work, assume tweet doesn't exist
-        return TweetData(
+        return TweetRecord(
             tweetId=tweet_id,
             authorUsername="unknown",
             tweetText="",
@@ -710,7 +2653,7 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
         
     except Exception as e:
         # On any error, return as non-existent
-        return TweetData(
+        return TweetRecord(
             tweetId=tweet_id,
             authorUsername="unknown",
             tweetText="",
@@ -719,6 +2662,85 @@ def extract_tweet_data_from_html(soup: BeautifulSoup, tweet_id: str, url: str) -
             timestamp=0
         )
 
+# Response projection: ?fields= keeps only the named fields, ?compact=true keeps
+# the COMPACT_* ones. verify-tweet fields are its own keys or data.<field>, for
+# the fields of TweetData or, with commitment=true, TweetCommitment.
+TWEET_FIELDS = tuple(TweetData.model_fields)
+COMMITMENT_FIELDS = tuple(TweetCommitment.model_fields)
+VERIFY_FIELDS = ("verified", "tweet_id", "created_at", "data", "message", "quorum", "source") + tuple(
+    f"data.{field}" for field in dict.fromkeys(TWEET_FIELDS + COMMITMENT_FIELDS)
+)
+COMPACT_TWEET_FIELDS = ["tweetId", "authorUsername", "exists", "timestamp"]
+COMPACT_VERIFY_FIELDS = ["verified", "tweet_id"]
+
+def parse_fields(fields: Optional[str], compact: bool, allowed: tuple, compact_fields: list) -> Optional[list]:
+    """Field names requested by `fields` (comma separated) or `compact`; None for all"""
+    if fields is None:
+        return compact_fields if compact else None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    if not requested or any(field not in allowed for field in requested):
+        raise HTTPException(status_code=400, detail=f"fields must be a comma separated subset of {','.join(allowed)}")
+    return requested
+
+def project(payload: dict, fields: list) -> dict:
+    """payload with only `fields`, in their order; "data.x" picks x from the nested data object"""
+    projected = {}
+    for field in fields:
+        key, _, child = field.partition(".")
+        if key not in payload:
+            continue
+        value = payload[key]
+        if not child:
+            projected[key] = value
+        elif value is None:
+            projected.setdefault(key, None)
+        else:
+            nested = projected.setdefault(key, {})
+            if isinstance(nested, dict) and child in value:
+                nested[child] = value[child]
+    return projected
+
+def json_response(payload) -> Response:
+    """Serialize directly, skipping FastAPI's response validation and jsonable_encoder pass"""
+    return Response(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), media_type="application/json")
+
+# Recently handed out commitments, (author, text) -> contentHash: keccak256 in
+# pure Python takes about a millisecond per tweet and each new one is stored once
+COMMITMENT_MEMO_SIZE = int(os.getenv("COMMITMENT_MEMO_SIZE", "4096"))
+recent_commitments = collections.OrderedDict()
+
+async def commit_tweet(tweet_data: TweetData) -> TweetCommitment:
+    """The commitment form of a result; the text behind new hashes goes to the commitment store"""
+    content_hash = EMPTY_COMMITMENT
+    if tweet_data.exists:
+        key = (tweet_data.authorUsername, tweet_data.tweetText)
+        content_hash = recent_commitments.get(key)
+        if content_hash is None:
+            content_hash, preimage = content_commitment(*key)
+            if commitment_store is not None:
+                await commitment_store.put_async(content_hash, tweet_data, preimage)
+            recent_commitments[key] = content_hash
+            if len(recent_commitments) > COMMITMENT_MEMO_SIZE:
+                recent_commitments.popitem(last=False)
+        else:
+            recent_commitments.move_to_end(key)
+    return TweetCommitment(
+        tweetId=tweet_data.tweetId,
+        contentHash=content_hash,
+        exists=tweet_data.exists,
+        timestamp=tweet_data.timestamp
+    )
+
+def tweet_response(tweet_data: TweetData | TweetCommitment, fields: Optional[list]) -> Response:
+    include = set(fields) if fields is not None else None
+    return Response(tweet_data.model_dump_json(include=include), media_type="application/json")
+
+def verify_response(payload: dict, fields: Optional[list]) -> Response:
+    data = payload.get("data")
+    if data is not None:
+        payload["data"] = data.model_dump()
+    return json_response(project(payload, fields) if fields is not None else payload)
+
 @app.get("/")
 async def root():
     return {
@@ -732,8 +2754,24 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 @app.get("/api/v1/tweets/{tweet_id}", response_model=TweetData)
-async def get_tweet(tweet_id: str):
-    """Get tweet data by ID - compatible with FDC Web2Json"""
+async def get_tweet(
+    request: Request,
+    tweet_id: str,
+    username: Optional[str] = None,
+    quorum: int = 0,
+    fields: Optional[str] = None,
+    compact: bool = False,
+    commitment: bool = False,
+    x_cluster_forwarded: Optional[str] = Header(None),
+    x_cluster_secret: Optional[str] = Header(None),
+    lane: str = Depends(request_lane)
+):
+    """Get tweet data by ID - compatible with FDC Web2Json
+    
+    fields (comma separated TweetData fields) or compact=true trim the response.
+    commitment=true returns a TweetCommitment instead, whose contentHash stands
+    for the author and text (see /api/v1/commitments/{content_hash}).
+    """
     
     # Extract tweet ID from URL if provided
     try:
@@ -741,29 +2779,128 @@ async def get_tweet(tweet_id: str):
     except HTTPException:
         raise HTTPException(status_code=400, detail="Invalid tweet ID format")
     
-    # Scrape tweet data from Twitter/X
-    return await scrape_tweet_from_twitter(clean_tweet_id)
+    # Serve from the result cache or owning node, or scrape tweet data from Twitter/X
+    if username is not None and not USERNAME_PATTERN.match(username):
+        raise HTTPException(status_code=400, detail="Invalid username format")
+    if commitment:
+        # Already constant size, so compact has nothing to drop
+        selected = parse_fields(fields, False, COMMITMENT_FIELDS, [])
+    else:
+        selected = parse_fields(fields, compact, TWEET_FIELDS, COMPACT_TWEET_FIELDS)
+    if quorum:
+        # Attestation-grade lookup: exists only if `quorum` independent sources agree
+        if not 1 <= quorum <= QUORUM_MAX:
+            raise HTTPException(status_code=400, detail=f"quorum must be between 1 and {QUORUM_MAX}")
+        tweet_data, _ = await cancel_on_disconnect(
+            request, fetch_tweet_with_quorum(clean_tweet_id, username, quorum, lane)
+        )
+    else:
+        # Only a peer's forward is served here regardless of ownership; anyone else
+        # setting the header is forwarded to the owner like any other request
+        forwarded = bool(x_cluster_forwarded) and from_cluster_peer(x_cluster_secret)
+        tweet_data = await cancel_on_disconnect(
+            request, fetch_tweet(clean_tweet_id, forwarded=forwarded, lane=lane, username=username)
+        )
+    if commitment:
+        return tweet_response(await commit_tweet(tweet_data), selected)
+    return tweet_response(tweet_data, selected)
 
 @app.get("/api/v1/verify-tweet")
-async def verify_tweet(url: str):
-    """Verify tweet existence by URL - user-friendly endpoint"""
+async def verify_tweet(
+    request: Request,
+    url: str,
+    posted_after: Optional[int] = None,
+    mode: str = "full",
+    quorum: int = 2,
+    fields: Optional[str] = None,
+    compact: bool = False,
+    commitment: bool = False,
+    lane: str = Depends(request_lane)
+):
+    """Verify tweet existence by URL - user-friendly endpoint
+    
+    posted_after (Unix seconds, e.g. an event's start) rejects tweets older
+    than that from the tweet ID alone, without fetching anything.
+    mode=exists only checks existence (status codes and redirects, no page
+    bodies) and returns a compact response without tweet data.
+    mode=quorum verifies only when `quorum` independent sources, fetched
+    concurrently, agree on the text and author.
+    fields (e.g. "verified" or "data" for FDC) or compact=true (verified and
+    tweet_id) trim the response. commitment=true puts a TweetCommitment in
+    data, for constant-size Web2Json proofs.
+    """
+    if mode not in ("full", "exists", "quorum"):
+        raise HTTPException(status_code=400, detail="mode must be 'full', 'exists' or 'quorum'")
+    if mode == "quorum" and not 1 <= quorum <= QUORUM_MAX:
+        raise HTTPException(status_code=400, detail=f"quorum must be between 1 and {QUORUM_MAX}")
+    selected = parse_fields(fields, compact, VERIFY_FIELDS, COMPACT_VERIFY_FIELDS)
     
     try:
-        tweet_id = extract_tweet_id(url)
-        tweet_data = await get_tweet(tweet_id)
+        tweet_id, username = extract_tweet_ref(url)
+        if posted_after is not None and not tweeted_after(tweet_id, posted_after):
+            return verify_response({
+                "verified": False,
+                "tweet_id": tweet_id,
+                "created_at": snowflake_created_at(tweet_id),
+                "data": None,
+                "message": "Tweet was posted before the required start time"
+            }, selected)
         
-        return {
+        if mode == "exists":
+            existence = await cancel_on_disconnect(request, check_tweet_exists(tweet_id, lane))
+            return verify_response(
+                {"verified": existence["exists"], "tweet_id": tweet_id, "source": existence["source"]}, selected
+            )
+        
+        if mode == "quorum":
+            tweet_data, report = await cancel_on_disconnect(
+                request, fetch_tweet_with_quorum(tweet_id, username, quorum, lane)
+            )
+            if tweet_data.exists:
+                message = f"Tweet verified by {report['agreeing']} agreeing sources"
+            elif report["agreeing"]:
+                message = "Sources disagree on the tweet content"
+            else:
+                message = "Tweet not found"
+            return verify_response({
+                "verified": tweet_data.exists,
+                "tweet_id": tweet_id,
+                "created_at": snowflake_created_at(tweet_id),
+                "data": (await commit_tweet(tweet_data) if commitment else tweet_data) if tweet_data.exists else None,
+                "quorum": report,
+                "message": message
+            }, selected)
+        
+        tweet_data = await cancel_on_disconnect(request, fetch_tweet(tweet_id, lane=lane, username=username))
+        
+        return verify_response({
             "verified": tweet_data.exists,
             "tweet_id": tweet_id,
-            "data": tweet_data if tweet_data.exists else None,
+            "created_at": snowflake_created_at(tweet_id),
+            "data": (await commit_tweet(tweet_data) if commitment else tweet_data) if tweet_data.exists else None,
             "message": "Tweet verified successfully" if tweet_data.exists else "Tweet not found"
-        }
+        }, selected)
     
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
 
+@app.get("/api/v1/commitments/{content_hash}")
+async def get_commitment(content_hash: str):
+    """Author and text behind a contentHash from commitment=true, with the hashed preimage
+    
+    keccak256(preimage) equals contentHash; the preimage is the casefolded
+    author, a newline and the normalized text.
+    """
+    content_hash = content_hash.lower()
+    if not re.fullmatch(r'0x[0-9a-f]{64}', content_hash):
+        raise HTTPException(status_code=400, detail="content_hash must be 0x followed by 64 hex digits")
+    entry = await commitment_store.get_async(content_hash) if commitment_store is not None else None
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Unknown commitment")
+    return entry
+
 @app.get("/api/v1/status")
 async def api_status():
     """Check API status and scraping configuration"""
@@ -773,6 +2910,20 @@ async def api_status():
         "verification_method": "web_scraping",
         "twitter_base_url": TWITTER_BASE_URL,
         "user_agents_count": len(USER_AGENTS),
+        "result_cache": result_cache.stats() if result_cache else {"enabled": False},
+        "author_index": author_index.stats() if author_index else {"enabled": False},
+        "commitment_store": commitment_store.stats() if commitment_store else {"enabled": False},
+        "x_guest_session": x_guest_session.stats() if x_guest_session else {"enabled": False},
+        "source_timeouts": source_timeouts.stats(),
+        "dns_cache": dns_cache.stats(),
+        "inflight_bytes": inflight_bytes.stats(),
+        "raw_archive": raw_archive.stats() if raw_archive else {"enabled": False},
+        "admission": admission.stats() if admission else {"enabled": False},
+        "client_disconnects": disconnect_stats,
+        "compression": {"enabled": COMPRESSION_ENABLED, "encodings": COMPRESSION_ENCODINGS, **compression_stats},
+        "cluster": {"enabled": True, "self": CLUSTER_SELF_URL, "nodes": CLUSTER_NODES, **cluster_stats} if cluster_ring else {"enabled": False},
+        "worker_pid": os.getpid(),
+        "event_loop": type(asyncio.get_running_loop()).__module__,
         "timestamp": datetime.now().isoformat(),
         "version": "1.0.0"
     }
@@ -809,8 +2960,11 @@ async def test_scraping():
         }
 
 @app.get("/api/v1/scraping/debug/{tweet_id}")
-async def debug_scraping(tweet_id: str):
+async def debug_scraping(request: Request, tweet_id: str):
     """Debug endpoint to see what URLs are being tried and what content is found"""
+    return await cancel_on_disconnect(request, collect_debug_info(tweet_id))
+
+async def collect_debug_info(tweet_id: str) -> dict:
     try:
         debug_info = {
             "tweet_id": tweet_id,
@@ -819,21 +2973,8 @@ async def debug_scraping(tweet_id: str):
             "timestamp": datetime.now().isoformat()
         }
         
-        # Construct URLs to try (use same as main function)
-        urls_to_try = [
-            # Try direct nitter instances first (better for scraping)
-            f"https://nitter.net/i/status/{tweet_id}",
-            f"https://nitter.poast.org/i/status/{tweet_id}",
-            f"https://nitter.privacydev.net/i/status/{tweet_id}",
-            # Try public Twitter embeds (no auth needed)
-            f"https://publish.twitter.com/oembed?url=https://twitter.com/i/web/status/{tweet_id}",
-            # Try Twitter API URL (sometimes has JSON data)
-            f"https://api.twitter.com/1.1/statuses/show/{tweet_id}.json",
-            # Try X/Twitter web URLs
-            f"https://x.com/i/web/status/{tweet_id}",
-            f"https://twitter.com/i/web/status/{tweet_id}",
-            f"https://x.com/twitter/status/{tweet_id}",
-        ]
+        # Construct URLs to try (same as the main function)
+        urls_to_try = tweet_source_urls(tweet_id)
         
         # Try each URL and log what we find
         for url in urls_to_try:
@@ -852,18 +2993,17 @@ async def debug_scraping(tweet_id: str):
                 }
                 
                 async with httpx.AsyncClient(
-                    timeout=15.0,
                     follow_redirects=True,
                     headers=headers
-                ) as client:
-                    response = await client.get(url)
+                ) as client, upstream_page(client, url, headers) as (response, body):
                     url_info["status_code"] = response.status_code
                     
                     if response.status_code == 200:
+                        page_text = body.decode(response.encoding or "utf-8", errors="replace")
                         # Check if JSON response
                         if response.headers.get('content-type', '').startswith('application/json'):
                             try:
-                                json_data = response.json()
+                                json_data = json.loads(page_text)
                                 url_info["is_json"] = True
                                 url_info["json_keys"] = list(json_data.keys()) if isinstance(json_data, dict) else []
                                 
@@ -877,7 +3017,7 @@ async def debug_scraping(tweet_id: str):
                             except:
                                 url_info["json_parse_error"] = True
                         else:
-                            soup = BeautifulSoup(response.text, 'html.parser')
+                            soup = bs4.BeautifulSoup(limit_page_size(page_text), 'html.parser')
                             
                             # Extract basic info
                             title_tag = soup.find('title')
@@ -910,8 +3050,9 @@ async def debug_scraping(tweet_id: str):
                                     break
                             
                             # Check if tweet ID appears in content
-                            if tweet_id in response.text:
+                            if tweet_id in page_text:
                                 url_info["tweet_id_found_in_content"] = True
+                            soup.decompose()
                             
                 debug_info["urls_tried"].append(url_info)
                 
@@ -920,7 +3061,7 @@ async def debug_scraping(tweet_id: str):
                 debug_info["urls_tried"].append(url_info)
         
         # Also run the actual scraping function
-        debug_info["final_result"] = await scrape_tweet_from_twitter(tweet_id)
+        debug_info["final_result"] = (await scrape_tweet_from_twitter(tweet_id)).to_model()
         
         return debug_info
         
@@ -930,6 +3071,154 @@ async def debug_scraping(tweet_id: str):
             "timestamp": datetime.now().isoformat()
         }
 
+@app.get("/api/v1/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """List stored request profiles, newest first"""
+    profiles = []
+    if os.path.isdir(PROFILE_DIR):
+        for name in sorted(os.listdir(PROFILE_DIR), reverse=True):
+            if name.endswith('.pstats'):
+                stat = os.stat(os.path.join(PROFILE_DIR, name))
+                profiles.append({
+                    "name": name,
+                    "size": stat.st_size,
+                    "created": datetime.fromtimestamp(stat.st_mtime).isoformat()
+                })
+    
+    return {"profile_dir": PROFILE_DIR, "count": len(profiles), "profiles": profiles}
+
+@app.get("/api/v1/admin/profiles/{name}", dependencies=[Depends(require_admin)])
+async def download_profile(name: str):
+    """Download a stored profile (open it with pstats, snakeviz or flameprof)"""
+    if not re.fullmatch(r'[A-Za-z0-9_.-]+\.pstats', name):
+        raise HTTPException(status_code=400, detail="Invalid profile name")
+    
+    path = os.path.join(PROFILE_DIR, name)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
+
+MEMORY_GROUPINGS = ("lineno", "filename", "traceback")
+
+def memory_report(top: int, group_by: str, compare: bool) -> dict:
+    global last_memory_snapshot
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ])
+    if compare and last_memory_snapshot is not None:
+        stats = snapshot.compare_to(last_memory_snapshot, group_by)
+    else:
+        stats = snapshot.statistics(group_by)
+    last_memory_snapshot = snapshot
+    
+    allocations = []
+    for stat in stats[:top]:
+        entry = {
+            "location": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size_bytes": stat.size,
+            "count": stat.count,
+        }
+        if isinstance(stat, tracemalloc.StatisticDiff):
+            entry["size_diff_bytes"] = stat.size_diff
+            entry["count_diff"] = stat.count_diff
+        allocations.append(entry)
+    current, peak = tracemalloc.get_traced_memory()
+    return {"traced_bytes": current, "traced_peak_bytes": peak, "compared": compare, "top": allocations}
+
+@app.get("/api/v1/admin/memory", dependencies=[Depends(require_admin)])
+async def memory_usage(top: int = 20, group_by: str = "lineno", compare: bool = False):
+    """Top allocation sites from a tracemalloc snapshot, plus in-flight body bytes and peak RSS"""
+    if group_by not in MEMORY_GROUPINGS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {', '.join(MEMORY_GROUPINGS)}")
+    report = {
+        "tracing": tracemalloc.is_tracing(),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "inflight_bytes": inflight_bytes.stats(),
+        "worker_pid": os.getpid(),
+    }
+    if tracemalloc.is_tracing():
+        report.update(await asyncio.to_thread(memory_report, max(1, min(top, 500)), group_by, compare))
+    return report
+
+@app.post("/api/v1/admin/memory/start", dependencies=[Depends(require_admin)])
+async def start_memory_tracing(frames: int = 1):
+    """Start tracing allocations in this worker; only allocations made from now on are seen"""
+    global last_memory_snapshot
+    if not tracemalloc.is_tracing():
+        last_memory_snapshot = None
+        tracemalloc.start(max(1, min(frames, 50)))
+    return {"tracing": True, "frames": tracemalloc.get_traceback_limit(), "worker_pid": os.getpid()}
+
+@app.post("/api/v1/admin/memory/stop", dependencies=[Depends(require_admin)])
+async def stop_memory_tracing():
+    global last_memory_snapshot
+    last_memory_snapshot = None
+    tracemalloc.stop()
+    return {"tracing": False, "worker_pid": os.getpid()}
+
+# Warm-up: right after startup, load the lazily imported modules in a thread
+# while the server starts listening, so neither /health nor the first scrape
+# waits for them, then pre-open upstream connections. WARM_UP=0 leaves the
+# modules to the first request that needs them.
+WARM_UP = os.getenv("WARM_UP", "1") == "1"
+
+def load_lazy_modules():
+    # httpx first: every scrape needs it, only HTML sources need bs4
+    httpx.AsyncClient
+    bs4.BeautifulSoup("<p>warm-up</p>", "html.parser")
+
+async def warm_up():
+    if WARM_UP:
+        await asyncio.to_thread(load_lazy_modules)
+    if UPSTREAM_PREWARM_CONNECTIONS > 0:
+        await prewarm_upstreams()
+
+@app.on_event("startup")
+async def start_warm_up():
+    asyncio.get_running_loop().create_task(warm_up())
+
+# Event loop and HTTP parser for production mode: "fast" is uvloop + httptools
+# (both installed by uvicorn[standard]), "asyncio" the stdlib loop + h11, and
+# "auto" leaves the choice to uvicorn
+RUNTIME_PROFILES = {
+    "fast": {"loop": "uvloop", "http": "httptools"},
+    "asyncio": {"loop": "asyncio", "http": "h11"},
+    "auto": {"loop": "auto", "http": "auto"},
+}
+RUNTIME_PROFILE = os.getenv("RUNTIME_PROFILE", "fast")
+
+def runtime_options() -> dict:
+    """uvicorn loop/http options for RUNTIME_PROFILE"""
+    if RUNTIME_PROFILE not in RUNTIME_PROFILES:
+        raise SystemExit(f"RUNTIME_PROFILE must be one of {', '.join(RUNTIME_PROFILES)}")
+    options = dict(RUNTIME_PROFILES[RUNTIME_PROFILE])
+    for option, module in (("loop", "uvloop"), ("http", "httptools")):
+        if options[option] == module and importlib.util.find_spec(module) is None:
+            # Not installable on every platform (uvloop has no Windows build)
+            options[option] = "auto"
+    return options
+
+def default_worker_count() -> int:
+    """Worker processes for production mode: WEB_CONCURRENCY or the usable CPUs"""
+    if os.getenv("WEB_CONCURRENCY"):
+        return max(1, int(os.getenv("WEB_CONCURRENCY")))
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return os.cpu_count() or 1
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Production mode: one worker per CPU, all sharing the SQLite result cache.
+    # The long keep-alive avoids uvicorn dropping slow responses on reused connections.
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=default_worker_count(),
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE_TIMEOUT", "75")),
+        **runtime_options()
+    )
@@ -0,0 +1,129 @@
+"""Re-run the current extractors over the raw page archive, without network I/O.
+
+Reads the fetches recorded in RAW_ARCHIVE_PATH (see readme.md), extracts each
+archived body again in a pool of worker processes and takes, per tweet, the
+first usable result in fetch order, like the scraper does. By default it only
+reports; --compare lists tweets whose result differs from the result cache and
+--backfill writes the new results to the result cache and author index.
+
+    python reextract.py --archive raw_archive.sqlite3
+    python reextract.py --archive raw_archive.sqlite3 --compare --jobs 8
+    python reextract.py --archive raw_archive.sqlite3 --backfill --tweet-id 1940801319423623380
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from email.message import Message
+
+import main
+
+# Per worker process: its own archive connection
+worker_archive = None
+
+
+def init_worker(path: str):
+    global worker_archive
+    worker_archive = main.RawArchive(path)
+
+
+def decode_body(body: bytes, content_type: str) -> str:
+    message = Message()
+    message["content-type"] = content_type
+    return body.decode(message.get_content_charset() or "utf-8", errors="replace")
+
+
+def extract_fetch(fetch: tuple) -> tuple:
+    """(tweet_id, url, result JSON or None, author confirmed, error or None) for one archived fetch"""
+    tweet_id, url, content_type, digest = fetch
+    try:
+        body = worker_archive.body(digest)
+        if body is None:
+            return tweet_id, url, None, False, "body missing"
+        tweet_data = main.extract_from_response(url, tweet_id, content_type, decode_body(body, content_type))
+    except Exception as e:
+        return tweet_id, url, None, False, f"{type(e).__name__}: {e}"
+    if tweet_data is None:
+        return tweet_id, url, None, False, None
+    return tweet_id, url, tweet_data.to_model().model_dump_json(), tweet_data.author_confirmed, None
+
+
+def reextract(path: str, tweet_ids: list, jobs: int) -> tuple:
+    """tweet ID -> (url, TweetData, author confirmed) of the first usable archived fetch, plus counts"""
+    fetches = main.RawArchive(path).fetches(tweet_ids)
+    results, counts = {}, {"fetches": len(fetches), "errors": 0}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(path,)) as pool:
+        chunksize = max(1, len(fetches) // (jobs * 4))
+        for tweet_id, url, result, author_confirmed, error in pool.map(extract_fetch, fetches, chunksize=chunksize):
+            if error:
+                counts["errors"] += 1
+                print(f"error {tweet_id} {url}: {error}", file=sys.stderr)
+            elif result is not None and tweet_id not in results:
+                tweet_data = main.TweetData.model_validate_json(result)
+                tweet_data.createdAt = main.snowflake_created_at(tweet_id) or tweet_data.createdAt
+                results[tweet_id] = (url, tweet_data, author_confirmed)
+    counts["tweets"] = len({fetch[0] for fetch in fetches})
+    counts["found"] = len(results)
+    return results, counts
+
+
+def compare(results: dict) -> list:
+    """Tweets whose re-extracted author or text differs from the cached result"""
+    changed = []
+    for tweet_id, (url, tweet_data, _) in sorted(results.items()):
+        cached = main.result_cache.get(tweet_id)
+        if cached is None or (cached.authorUsername, cached.tweetText) != (tweet_data.authorUsername, tweet_data.tweetText):
+            changed.append({
+                "tweet_id": tweet_id,
+                "source": url,
+                "cached": {"author": cached.authorUsername, "text": cached.tweetText} if cached else None,
+                "reextracted": {"author": tweet_data.authorUsername, "text": tweet_data.tweetText},
+            })
+    return changed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", default=main.RAW_ARCHIVE_PATH, help="archive file (default $RAW_ARCHIVE_PATH)")
+    parser.add_argument("--tweet-id", action="append", default=[], help="only these tweets (repeatable)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--compare", action="store_true", help="list results that differ from the result cache")
+    parser.add_argument("--backfill", action="store_true", help="write results to the result cache and author index")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None) -> int:
+    args = parse_args(argv)
+    if not args.archive or not os.path.exists(args.archive):
+        print("no archive: set RAW_ARCHIVE_PATH or pass --archive", file=sys.stderr)
+        return 2
+    if (args.compare or args.backfill) and main.result_cache is None:
+        print("--compare and --backfill need RESULT_CACHE_PATH", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    results, report = reextract(args.archive, args.tweet_id, args.jobs)
+    report["elapsed_s"] = round(time.perf_counter() - start, 3)
+    if args.compare:
+        report["changed"] = compare(results)
+        for change in report["changed"]:
+            print(json.dumps(change, ensure_ascii=False))
+    if args.backfill:
+        for tweet_id, (_, tweet_data, author_confirmed) in results.items():
+            main.result_cache.put(tweet_data)
+            if main.author_index is not None and author_confirmed:
+                main.author_index.put(tweet_id, tweet_data.authorUsername)
+        report["backfilled"] = len(results)
+
+    print(", ".join(f"{key}={value}" for key, value in report.items() if key != "changed"))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())